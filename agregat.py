@@ -0,0 +1,147 @@
+# agregat.py
+import logging
+
+# Batas jumlah id dalam satu klausa IN agar query tetap wajar
+CHUNK_KUNCI = 500
+
+# === Tabel Agregat Materialized (dipakai insight tanpa scan Fact_Nilai_MK) ===
+AGREGAT_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS Agg_Mahasiswa (
+        id_mahasiswa INT PRIMARY KEY,
+        total_sks INT NOT NULL,
+        total_bobot DECIMAL(12,2) NOT NULL,
+        jumlah_mk INT NOT NULL,
+        total_bobot_mentah DECIMAL(12,2) NOT NULL,
+        sks_lulus INT NOT NULL,
+        jumlah_mk_lulus INT NOT NULL,
+        total_sks_terbaik INT NOT NULL,
+        total_bobot_terbaik DECIMAL(12,2) NOT NULL,
+        sks_lulus_terbaik INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Agg_MataKuliah (
+        id_mk INT PRIMARY KEY,
+        jumlah INT NOT NULL,
+        total_bobot_mentah DECIMAL(12,2) NOT NULL,
+        lulus INT NOT NULL,
+        tidak_lulus INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Agg_Waktu (
+        id_waktu INT PRIMARY KEY,
+        total_sks INT NOT NULL,
+        total_bobot DECIMAL(12,2) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Agg_Nilai (
+        id_nilai INT PRIMARY KEY,
+        jumlah INT NOT NULL
+    )
+    """
+]
+
+# Tabel agregat -> (kolom kunci di Fact_Nilai_MK, SELECT agregat; {where} diisi filter kunci).
+# Semua dihitung dari measure fakta (sks, bobot, lulus) tanpa join dimensi.
+# Kolom *_terbaik Agg_Mahasiswa (IPK, SKS lulus) hanya menghitung percobaan terbaik tiap MK; kolom lain semua percobaan.
+AGREGAT = {
+    "Agg_Mahasiswa": ("id_mahasiswa", """
+        SELECT f.id_mahasiswa,
+               SUM(f.sks) AS total_sks,
+               SUM(f.bobot * f.sks) AS total_bobot,
+               COUNT(*) AS jumlah_mk,
+               SUM(f.bobot) AS total_bobot_mentah,
+               SUM(f.lulus * f.sks) AS sks_lulus,
+               SUM(f.lulus) AS jumlah_mk_lulus,
+               SUM(f.sks * f.percobaan_terbaik) AS total_sks_terbaik,
+               SUM(f.bobot * f.sks * f.percobaan_terbaik) AS total_bobot_terbaik,
+               SUM(f.lulus * f.sks * f.percobaan_terbaik) AS sks_lulus_terbaik
+        FROM Fact_Nilai_MK f
+        {where}
+        GROUP BY f.id_mahasiswa
+    """),
+    "Agg_MataKuliah": ("id_mk", """
+        SELECT f.id_mk,
+               COUNT(*) AS jumlah,
+               SUM(f.bobot) AS total_bobot_mentah,
+               SUM(f.lulus) AS lulus,
+               COUNT(*) - SUM(f.lulus) AS tidak_lulus
+        FROM Fact_Nilai_MK f
+        {where}
+        GROUP BY f.id_mk
+    """),
+    "Agg_Waktu": ("id_waktu", """
+        SELECT f.id_waktu,
+               SUM(f.sks) AS total_sks,
+               SUM(f.bobot * f.sks) AS total_bobot
+        FROM Fact_Nilai_MK f
+        {where}
+        GROUP BY f.id_waktu
+    """),
+    "Agg_Nilai": ("id_nilai", """
+        SELECT f.id_nilai,
+               COUNT(*) AS jumlah
+        FROM Fact_Nilai_MK f
+        {where}
+        GROUP BY f.id_nilai
+    """)
+}
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# === Kunci yang terdampak load: satu set id per kolom kunci agregat ===
+def kunci_baru():
+    return {key: set() for key, _ in AGREGAT.values()}
+
+
+def catat_kunci(kunci, fact_rows):
+    # fact_rows: (id_mahasiswa, id_mk, id_waktu, id_nilai, ...) seperti yang dimuat ke Fact_Nilai_MK
+    for row in fact_rows:
+        kunci["id_mahasiswa"].add(row[0])
+        kunci["id_mk"].add(row[1])
+        kunci["id_waktu"].add(row[2])
+        kunci["id_nilai"].add(row[3])
+
+
+def kunci_mahasiswa(cursor, nrp, kunci):
+    # Dipanggil sebelum fakta mahasiswa dihapus, supaya agregat yang ikut berubah tetap di-refresh
+    cursor.execute("""
+        SELECT f.id_mahasiswa, f.id_mk, f.id_waktu, f.id_nilai
+        FROM Fact_Nilai_MK f JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
+        WHERE m.nrp = %s
+    """, (nrp,))
+    catat_kunci(kunci, cursor.fetchall())
+
+
+# === Refresh Agregat: penuh (kunci=None) atau hanya untuk kunci yang terdampak ===
+def refresh_agregat(cursor, kunci=None):
+    for table, (key, select_sql) in AGREGAT.items():
+        if kunci is None:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} " + select_sql.format(where=""))
+            continue
+
+        ids = sorted(kunci[key])
+        for chunk in _chunks(ids, CHUNK_KUNCI):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            # Kunci tanpa fakta tersisa cukup terhapus; sisanya dihitung ulang di database
+            cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({placeholders})", chunk)
+            cursor.execute(
+                f"INSERT INTO {table} " + select_sql.format(where=f"WHERE f.{key} IN ({placeholders})"),
+                chunk
+            )
+
+    if kunci is None:
+        logging.info("🧮 [INFO]: Tabel agregat dibangun ulang penuh.")
+    else:
+        logging.info(
+            "🧮 [INFO]: Agregat di-refresh untuk "
+            + ", ".join(f"{len(ids)} {key}" for key, ids in kunci.items()) + "."
+        )
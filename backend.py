@@ -0,0 +1,261 @@
+# backend.py
+import os
+import queue
+import logging
+import sqlite3
+from contextlib import contextmanager
+from dim_cache import DimCache
+from bulk_loader import BulkLoader, FLUSH_SIZE
+
+# Jumlah koneksi maksimum di pool untuk pekerjaan paralel (mis. build index per tabel)
+POOL_SIZE = 4
+
+
+# === Backend Target: koneksi, DDL, bulk insert, resolusi kunci, dan upsert per dialek ===
+# Pipeline hanya berbicara lewat antarmuka ini; jalur cepat tiap dialek
+# (multi-row INSERT/LOAD DATA, COPY, RETURNING) ada di DimCache/BulkLoader.
+class Backend:
+    dialect = None
+    # Definisi primary key auto-increment untuk placeholder {serial} di DDL
+    serial = None
+    # PostgreSQL menolak semua perintah setelah error sampai transaksi di-rollback
+    error_batalkan_transaksi = False
+
+    def __init__(self, db_name, config=None):
+        self.db_name = db_name
+        self.config = config or {}
+        self.conn = None
+        self.cursor = None
+
+    # Siapkan database (buat/drop) lalu buka koneksi utama pipeline
+    def connect(self, reset=True):
+        self.siapkan_database(reset)
+        self.conn, self.cursor = self.buka_koneksi()
+
+    def siapkan_database(self, reset):
+        raise NotImplementedError
+
+    # Koneksi baru ke database yang sudah disiapkan: (conn, cursor)
+    def buka_koneksi(self):
+        raise NotImplementedError
+
+    # Pastikan transaksi terbuka sebelum SAVEPOINT pertama; MySQL dan psycopg2 membukanya otomatis
+    def mulai_transaksi(self):
+        pass
+
+    def pool(self, size=POOL_SIZE):
+        return KoneksiPool(self, size)
+
+    def buat_tabel(self, sqls):
+        for sql in sqls:
+            self.cursor.execute(sql.format(serial=self.serial))
+
+    def dim_cache(self, table, id_col, key_cols, attr_cols=()):
+        return DimCache(self.cursor, table, id_col, key_cols, attr_cols, dialect=self.dialect)
+
+    def bulk_loader(self, table, columns, flush_size=FLUSH_SIZE, auto_flush=True):
+        return BulkLoader(self.cursor, table, columns, dialect=self.dialect, flush_size=flush_size, auto_flush=auto_flush)
+
+    # values: dict kolom -> nilai; kunci: kolom natural key untuk mencari baris yang sudah ada
+    def get_or_create_id(self, table, id_col, kunci, values):
+        where = " AND ".join(f"{col} = %s" for col in kunci)
+        self.cursor.execute(f"SELECT {id_col} FROM {table} WHERE {where}", tuple(values[col] for col in kunci))
+        result = self.cursor.fetchone()
+        if result:
+            return result[0]
+        return self._insert_id(table, id_col, values)
+
+    def _insert_id(self, table, id_col, values):
+        placeholders = ", ".join(["%s"] * len(values))
+        self.cursor.execute(f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders})", tuple(values.values()))
+        return self.cursor.lastrowid
+
+    def upsert(self, table, values, kunci):
+        raise NotImplementedError
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.cursor.close()
+        self.conn.close()
+
+
+class MySQLBackend(Backend):
+    dialect = "mysql"
+    serial = "INT AUTO_INCREMENT PRIMARY KEY"
+
+    def __init__(self, db_name, config=None, load_data=False):
+        super().__init__(db_name, config)
+        # LOAD DATA LOCAL INFILE butuh local_infile=1 di server
+        self.load_data = load_data
+
+    def siapkan_database(self, reset):
+        import mysql.connector
+
+        conn = mysql.connector.connect(**self.config)
+        cursor = conn.cursor()
+        if reset:
+            cursor.execute(f"DROP DATABASE IF EXISTS {self.db_name}")
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.db_name}")
+        cursor.close()
+        conn.close()
+
+    def buka_koneksi(self):
+        import mysql.connector
+
+        conn = mysql.connector.connect(**self.config, database=self.db_name, allow_local_infile=self.load_data)
+        return conn, conn.cursor()
+
+    def bulk_loader(self, table, columns, flush_size=FLUSH_SIZE, auto_flush=True):
+        return BulkLoader(self.cursor, table, columns, dialect=self.dialect, flush_size=flush_size,
+                          load_data=self.load_data, auto_flush=auto_flush)
+
+    def upsert(self, table, values, kunci):
+        placeholders = ", ".join(["%s"] * len(values))
+        update = ", ".join(f"{col} = VALUES({col})" for col in values if col not in kunci)
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {update}",
+            tuple(values.values())
+        )
+
+
+class PostgresBackend(Backend):
+    dialect = "postgres"
+    serial = "SERIAL PRIMARY KEY"
+    error_batalkan_transaksi = True
+
+    def siapkan_database(self, reset):
+        import psycopg2
+
+        # CREATE/DROP DATABASE tidak boleh di dalam transaksi
+        conn_init = psycopg2.connect(**self.config, dbname="postgres")
+        conn_init.autocommit = True
+        cur_init = conn_init.cursor()
+        if reset:
+            cur_init.execute(f"DROP DATABASE IF EXISTS {self.db_name}")
+        cur_init.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.db_name,))
+        if not cur_init.fetchone():
+            cur_init.execute(f"CREATE DATABASE {self.db_name}")
+        cur_init.close()
+        conn_init.close()
+
+    def buka_koneksi(self):
+        import psycopg2
+
+        conn = psycopg2.connect(**self.config, dbname=self.db_name)
+        return conn, conn.cursor()
+
+    def _insert_id(self, table, id_col, values):
+        placeholders = ", ".join(["%s"] * len(values))
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders}) RETURNING {id_col}",
+            tuple(values.values())
+        )
+        return self.cursor.fetchone()[0]
+
+    def upsert(self, table, values, kunci):
+        placeholders = ", ".join(["%s"] * len(values))
+        update = ", ".join(f"{col} = EXCLUDED.{col}" for col in values if col not in kunci)
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(kunci)}) DO UPDATE SET {update}",
+            tuple(values.values())
+        )
+
+
+# === Cursor SQLite dengan placeholder %s seperti DB-API MySQL/PostgreSQL ===
+class _SQLiteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, sql, params=()):
+        return self.cursor.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql, rows):
+        return self.cursor.executemany(sql.replace("%s", "?"), rows)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+# === Target File: warehouse satu file SQLite (tanpa server) ===
+class SQLiteBackend(Backend):
+    dialect = "sqlite"
+    serial = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def siapkan_database(self, reset):
+        # db_name adalah path file; mode penuh membuat file baru
+        if reset and os.path.exists(self.db_name):
+            os.remove(self.db_name)
+        logging.info(f"🗃️ [INFO]: Warehouse SQLite di {self.db_name}.")
+
+    def buka_koneksi(self):
+        # Penulis SQLite saling mengunci file; koneksi pool menunggu giliran sampai timeout
+        conn = sqlite3.connect(self.db_name, timeout=60, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+        # CONCAT (dipakai insight_transkrip.sql) baru ada sejak SQLite 3.44
+        if sqlite3.sqlite_version_info < (3, 44, 0):
+            conn.create_function("CONCAT", -1, lambda *args: "".join("" if a is None else str(a) for a in args),
+                                 deterministic=True)
+        return conn, _SQLiteCursor(conn.cursor())
+
+    def mulai_transaksi(self):
+        # SAVEPOINT di luar transaksi akan menjadi transaksi sendiri dan ter-commit saat RELEASE
+        if not self.conn.in_transaction:
+            self.cursor.execute("BEGIN")
+
+    def pool(self, size=POOL_SIZE):
+        # Satu penulis per file database
+        return KoneksiPool(self, 1)
+
+    # Sintaks ON CONFLICT ... EXCLUDED sama dengan PostgreSQL
+    upsert = PostgresBackend.upsert
+
+
+# === Pool Koneksi: koneksi dibuka saat dibutuhkan (maks. size) dan dipakai ulang ===
+class KoneksiPool:
+    def __init__(self, backend, size=POOL_SIZE):
+        self.backend = backend
+        self.size = size
+        self.bebas = queue.Queue()
+        self.semua = []
+        self.slot = queue.Queue()
+        for _ in range(size):
+            self.slot.put(None)
+
+    @contextmanager
+    def cursor(self):
+        # Satu unit kerja = satu transaksi: commit bila selesai, rollback bila error
+        self.slot.get()
+        try:
+            conn, cursor = self.bebas.get_nowait()
+        except queue.Empty:
+            conn, cursor = self.backend.buka_koneksi()
+            self.semua.append((conn, cursor))
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.bebas.put((conn, cursor))
+            self.slot.put(None)
+
+    def close(self):
+        for conn, cursor in self.semua:
+            cursor.close()
+            conn.close()
+        self.semua.clear()
+
+
+BACKENDS = {
+    "mysql": MySQLBackend,
+    "postgres": PostgresBackend,
+    "sqlite": SQLiteBackend
+}
+
@@ -0,0 +1,160 @@
+# benchmark.py
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from pipeline import LoadETL, MODEL, buat_backend
+from extract_pdf import stream_mata_kuliah
+from transkrip_parser import TranskripStream
+from transkrip_sintetis import buat_banyak, SEED
+from instrumentasi import Instrumentasi
+
+# === Konfigurasi Benchmark ===
+UKURAN = [100, 1000, 10000]
+BACKEND_BENCH = ["sqlite", "postgres", "mysql"]
+# Database khusus benchmark (di-drop tiap run), terpisah dari database ETL asli
+BENCH_DB = {"sqlite": "bench_transkrip.sqlite", "postgres": "bench_transkrip", "mysql": "bench_transkrip"}
+
+HASIL_PATH = "benchmark_hasil.json"
+BASELINE_PATH = "benchmark_baseline.json"
+# Regresi bila throughput turun atau p95 latensi naik lebih dari batas ini dibanding baseline
+TOLERANSI = 0.20
+
+PERSENTIL = [50, 90, 95, 99]
+
+
+# Persentil nearest-rank dari data yang sudah terurut
+def persentil(data, p):
+    if not data:
+        return None
+    return data[min(len(data) - 1, max(0, -(-len(data) * p // 100) - 1))]
+
+
+# === Satu Skenario: transform + load N transkrip sintetis ke satu backend ===
+# Ekstraksi PDF tidak ikut diukur (teks sudah tersedia); latensi per file = parsing regex + load + bagian commit-nya.
+def bench(nama_backend, jumlah, model="2fact", seed=SEED):
+    ukur = Instrumentasi(per_file=False)
+    etl = LoadETL(buat_backend(nama_backend, BENCH_DB[nama_backend]), model, instrumentasi=ukur)
+    etl.buka()
+
+    latensi = []
+    mulai = time.perf_counter()
+    for nama, halaman in buat_banyak(jumlah, seed):
+        start = time.perf_counter()
+        parser = TranskripStream()
+        record = parser.hasil(stream_mata_kuliah(parser, halaman))
+        transform = time.perf_counter() - start
+        info = {"peak_mem": None, "tahap": {"transform": transform}, "baris": {"transform": len(record.mata_kuliah)}}
+        file_hash = hashlib.sha256("\f".join(halaman).encode("utf-8")).hexdigest()
+        etl.muat(nama, file_hash, record, info=info)
+        latensi.append(time.perf_counter() - start)
+    etl.akhiri()
+    etl.buat_index()
+    durasi = time.perf_counter() - mulai
+    etl.tutup()
+
+    latensi.sort()
+    ringkasan = ukur.ringkasan()
+    baris = ringkasan["tahap"].get("fakta", {}).get("baris", 0)
+    return {
+        "jumlah": jumlah,
+        "durasi_detik": durasi,
+        "file_per_detik": jumlah / durasi,
+        "baris_per_detik": baris / durasi,
+        "latensi_ms": dict({f"p{p}": persentil(latensi, p) * 1000 for p in PERSENTIL}, max=latensi[-1] * 1000),
+        "round_trip": ringkasan["round_trip"],
+        "tahap": {nama: total["detik"] for nama, total in ringkasan["tahap"].items()},
+        "peak_rss_kib": ringkasan["peak_rss_kib"]
+    }
+
+
+# === Bandingkan dengan Baseline: daftar pesan regresi ===
+def bandingkan(hasil, baseline, toleransi=TOLERANSI):
+    regresi = []
+    for kunci, h in hasil.items():
+        b = baseline.get(kunci)
+        if not b:
+            continue
+        if h["file_per_detik"] < b["file_per_detik"] * (1 - toleransi):
+            regresi.append(f"{kunci}: throughput {h['file_per_detik']:.1f} file/s < baseline {b['file_per_detik']:.1f}")
+        if h["latensi_ms"]["p95"] > b["latensi_ms"]["p95"] * (1 + toleransi):
+            regresi.append(f"{kunci}: p95 {h['latensi_ms']['p95']:.2f} ms > baseline {b['latensi_ms']['p95']:.2f} ms")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ETL dengan transkrip sintetis")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN, help="jumlah mahasiswa per skenario")
+    parser.add_argument("--backend", nargs="+", choices=BACKEND_BENCH, default=BACKEND_BENCH)
+    parser.add_argument("--model", choices=sorted(MODEL), default="2fact")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--simpan-baseline", action="store_true", help="simpan hasil run ini sebagai baseline")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI)
+    parser.add_argument("--ci", action="store_true",
+                        help="gagal bila tidak ada skenario yang jalan atau skenario belum punya baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        handlers=[logging.FileHandler("benchmark.log", mode='w', encoding='utf-8')],
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    hasil = {}
+    for nama_backend in args.backend:
+        for jumlah in args.ukuran:
+            kunci = f"{nama_backend}/{args.model}/{jumlah}"
+            try:
+                h = bench(nama_backend, jumlah, args.model, args.seed)
+            except ImportError as e:
+                print(f"⚠️ {kunci} dilewati: driver tidak terpasang ({e})")
+                break
+            except Exception as e:
+                # Server stand-in (PostgreSQL/MariaDB lokal) tidak wajib ada
+                print(f"⚠️ {kunci} dilewati: {e}")
+                break
+            hasil[kunci] = h
+            lat = h["latensi_ms"]
+            print(
+                f"⏱️ {kunci}: {h['file_per_detik']:.1f} file/s, {h['baris_per_detik']:.0f} baris/s, "
+                f"latensi p50 {lat['p50']:.2f} / p95 {lat['p95']:.2f} / p99 {lat['p99']:.2f} ms, "
+                f"{h['round_trip']} round-trip"
+            )
+
+    with open(HASIL_PATH, "w", encoding="utf-8") as f:
+        json.dump(hasil, f, indent=2)
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    if args.simpan_baseline:
+        baseline.update(hasil)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"✅ Baseline disimpan ke {args.baseline}")
+        return 0
+
+    regresi = bandingkan(hasil, baseline, args.toleransi)
+    for pesan in regresi:
+        print(f"❌ [REGRESI]: {pesan}")
+    # Baseline bergantung pada mesin, jadi tidak di-commit: di CI baseline disimpan dulu di runner yang sama
+    tanpa_baseline = [kunci for kunci in hasil if kunci not in baseline]
+    if tanpa_baseline:
+        print(f"ℹ️ Belum ada baseline untuk {', '.join(tanpa_baseline)} di {args.baseline}; jalankan dengan --simpan-baseline.")
+    elif hasil and not regresi:
+        print("✅ Tidak ada regresi dibanding baseline.")
+    if args.ci and (not hasil or tanpa_baseline):
+        print("❌ [CI]: " + ("Tidak ada skenario yang berhasil dijalankan." if not hasil
+                             else f"{len(tanpa_baseline)} skenario tidak dibandingkan dengan baseline."))
+        return 1
+    return 1 if regresi else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# benchmark_insight.py
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+from statistics import median
+from pipeline import buat_backend
+from insight_sql import baca_insight
+from benchmark import bench, BENCH_DB, BACKEND_BENCH
+
+# === Konfigurasi Benchmark Insight ===
+# Ukuran warehouse sintetis (jumlah mahasiswa); kelipatan tetap memudahkan membaca pertumbuhan waktu
+UKURAN = [1000, 4000, 16000]
+# Jumlah eksekusi hangat per insight (median yang dilaporkan)
+ULANG = 5
+
+HASIL_PATH = "benchmark_insight.json"
+
+# Waktu tumbuh superlinear bila eksponen log-log waktu vs baris fakta melewati batas ini;
+# query di bawah LANTAI_MS diabaikan karena didominasi overhead/noise
+BATAS_EKSPONEN = 1.3
+LANTAI_MS = 5.0
+
+# Prefix EXPLAIN per dialek, dicoba berurutan (ANALYZE ... = MariaDB, EXPLAIN ANALYZE = MySQL 8)
+EXPLAIN = {
+    "postgres": ["EXPLAIN (ANALYZE, BUFFERS) "],
+    "mysql": ["ANALYZE ", "EXPLAIN ANALYZE ", "EXPLAIN "],
+    "sqlite": ["EXPLAIN QUERY PLAN "]
+}
+
+
+def ambil_plan(conn, cursor, sql, dialect):
+    for prefix in EXPLAIN[dialect]:
+        try:
+            cursor.execute(prefix + sql)
+            return [" | ".join(str(kolom) for kolom in row) for row in cursor.fetchall()]
+        except Exception:
+            # PostgreSQL menolak perintah berikutnya sampai transaksi di-rollback
+            conn.rollback()
+    return None
+
+
+def _jalankan(cursor, sql):
+    start = time.perf_counter()
+    cursor.execute(sql)
+    baris = len(cursor.fetchall())
+    return time.perf_counter() - start, baris
+
+
+# === Ukur Semua Insight: dingin (koneksi baru, eksekusi pertama) lalu hangat (median ULANG eksekusi) ===
+# Cache OS/buffer pool server tidak di-flush; "dingin" berarti cache sesi & statement masih kosong.
+def ukur_insight(backend, insights, ulang=ULANG):
+    hasil = {}
+    for no in sorted(insights):
+        judul, sql = insights[no]
+        conn, cursor = backend.buka_koneksi()
+        try:
+            dingin, baris = _jalankan(cursor, sql)
+            hangat = median(_jalankan(cursor, sql)[0] for _ in range(ulang))
+            plan = ambil_plan(conn, cursor, sql, backend.dialect)
+        except Exception as e:
+            hasil[no] = {"judul": judul, "error": str(e)}
+            logging.error(f"💥 [ERROR]: Insight {no} ({judul}) gagal: {e}")
+            continue
+        finally:
+            cursor.close()
+            conn.close()
+        hasil[no] = {"judul": judul, "baris": baris, "dingin_ms": dingin * 1000, "hangat_ms": hangat * 1000, "plan": plan}
+        logging.info(f"📊 [INFO]: Insight {no} ({judul}): {baris} baris, dingin {dingin * 1000:.1f} ms, hangat {hangat * 1000:.1f} ms.")
+    return hasil
+
+
+def jumlah_fakta(backend):
+    conn, cursor = backend.buka_koneksi()
+    cursor.execute("SELECT COUNT(*) FROM Fact_Nilai_MK")
+    jumlah = cursor.fetchone()[0]
+    cursor.close()
+    conn.close()
+    return jumlah
+
+
+# Kemiringan regresi log(waktu) terhadap log(baris): ~1 linear, ~2 kuadratik
+def eksponen(titik):
+    titik = [(math.log(n), math.log(t)) for n, t in titik if n > 0 and t > 0]
+    if len(titik) < 2:
+        return None
+    rata_x = sum(x for x, _ in titik) / len(titik)
+    rata_y = sum(y for _, y in titik) / len(titik)
+    penyebut = sum((x - rata_x) ** 2 for x, _ in titik)
+    if penyebut == 0:
+        return None
+    return sum((x - rata_x) * (y - rata_y) for x, y in titik) / penyebut
+
+
+def cari_superlinear(hasil_backend, batas=BATAS_EKSPONEN, lantai_ms=LANTAI_MS):
+    per_insight = {}
+    for run in hasil_backend.values():
+        for no, h in run["insight"].items():
+            if "error" not in h:
+                per_insight.setdefault(no, []).append((run["baris_fakta"], h["hangat_ms"]))
+
+    temuan = []
+    for no, titik in sorted(per_insight.items()):
+        k = eksponen(titik)
+        if k is not None and k > batas and max(t for _, t in titik) >= lantai_ms:
+            temuan.append((no, k, titik))
+    return temuan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark & profil insight_transkrip.sql pada warehouse sintetis")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN, help="jumlah mahasiswa per warehouse")
+    parser.add_argument("--backend", nargs="+", choices=BACKEND_BENCH, default=BACKEND_BENCH)
+    parser.add_argument("--insight", type=int, nargs="*", help="nomor insight (default: semua)")
+    parser.add_argument("--ulang", type=int, default=ULANG)
+    parser.add_argument("--batas-eksponen", type=float, default=BATAS_EKSPONEN)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        handlers=[logging.FileHandler("benchmark_insight.log", mode='w', encoding='utf-8')],
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    insights = baca_insight()
+    if args.insight:
+        insights = {no: insights[no] for no in args.insight}
+
+    hasil = {}
+    superlinear = []
+    for nama_backend in args.backend:
+        hasil_backend = {}
+        for jumlah in sorted(args.ukuran):
+            try:
+                # Warehouse dibangun lewat pipeline yang sama dengan benchmark load (model 2 fakta)
+                bench(nama_backend, jumlah)
+            except Exception as e:
+                print(f"⚠️ {nama_backend}/{jumlah} dilewati: {e}")
+                break
+            backend = buat_backend(nama_backend, BENCH_DB[nama_backend])
+            baris_fakta = jumlah_fakta(backend)
+            logging.info(f"🏗️ [INFO]: Warehouse {nama_backend} {jumlah} mahasiswa ({baris_fakta} baris fakta).")
+            hasil_backend[jumlah] = {"baris_fakta": baris_fakta, "insight": ukur_insight(backend, insights, args.ulang)}
+        if not hasil_backend:
+            continue
+        hasil[nama_backend] = hasil_backend
+
+        for no in sorted(insights):
+            waktu = [
+                f"{run['insight'][no]['hangat_ms']:.1f}" if "error" not in run["insight"][no] else "gagal"
+                for run in hasil_backend.values()
+            ]
+            print(f"⏱️ {nama_backend} insight {no}: hangat {' / '.join(waktu)} ms pada {', '.join(map(str, hasil_backend))} mahasiswa")
+
+        for no, k, titik in cari_superlinear(hasil_backend, args.batas_eksponen):
+            superlinear.append({"backend": nama_backend, "insight": no, "eksponen": k, "titik": titik})
+            print(f"🐢 [SUPERLINEAR]: {nama_backend} insight {no} ({insights[no][0]}): waktu ~ baris^{k:.2f}")
+
+    with open(HASIL_PATH, "w", encoding="utf-8") as f:
+        json.dump({"hasil": hasil, "superlinear": superlinear}, f, indent=2)
+    print(f"✅ Hasil dan plan EXPLAIN ditulis ke {HASIL_PATH}")
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# bulk_loader.py
+import csv
+import io
+import logging
+import os
+import tempfile
+
+# Jumlah baris fakta default per flush
+FLUSH_SIZE = 5000
+
+
+# === Buffer Baris Fakta + Flush Bulk per Dialek ===
+class BulkLoader:
+    def __init__(self, cursor, table, columns, dialect="mysql", flush_size=FLUSH_SIZE, load_data=False, auto_flush=True):
+        self.cursor = cursor
+        self.table = table
+        self.columns = tuple(columns)
+        self.dialect = dialect
+        self.flush_size = flush_size
+        self.load_data = load_data
+        # auto_flush=False: flush hanya dipicu pemanggil (mis. di batas transaksi/savepoint)
+        self.auto_flush = auto_flush
+        self.rows = []
+        self.total = 0
+
+    def add(self, row):
+        self.rows.append(tuple(row))
+        if self.auto_flush and self.penuh():
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def clear(self):
+        self.rows.clear()
+
+    def penuh(self):
+        return len(self.rows) >= self.flush_size
+
+    # Posisi buffer saat savepoint dibuat; baris sesudahnya dibuang bila savepoint di-rollback
+    def tandai(self):
+        return len(self.rows)
+
+    def kembali_ke(self, tanda):
+        del self.rows[tanda:]
+
+    def flush(self):
+        if not self.rows:
+            return 0
+        jumlah = len(self.rows)
+        try:
+            if self.dialect == "postgres":
+                self._copy()
+            elif self.load_data:
+                self._load_data_infile()
+            else:
+                self._executemany()
+        finally:
+            # Baris yang gagal di-flush tidak dicoba ulang agar error tidak berulang di flush berikutnya
+            self.rows.clear()
+        self.total += jumlah
+        logging.info(f"🚚 [INFO]: {jumlah} baris di-flush ke {self.table} (total {self.total}).")
+        return jumlah
+
+    def _executemany(self):
+        # mysql.connector menulis ulang executemany INSERT menjadi satu multi-row INSERT
+        placeholders = ", ".join(["%s"] * len(self.columns))
+        self.cursor.executemany(
+            f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders})",
+            self.rows
+        )
+
+    def _copy(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(self.rows)
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def _load_data_infile(self):
+        # Butuh koneksi dengan allow_local_infile=True dan local_infile=1 di server
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerows(["\\N" if v is None else v for v in row] for row in self.rows)
+            self.cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.table} "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(self.columns)})",
+                (path.replace("\\", "/"),)
+            )
+        finally:
+            os.remove(path)
@@ -0,0 +1,68 @@
+# checkpoint.py
+import time
+import logging
+
+# === Checkpoint Run ETL: satu baris per run + progress per file yang sudah di-commit ===
+CHECKPOINT_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS ETL_Run (
+        run_id VARCHAR(20) PRIMARY KEY,
+        mode VARCHAR(20) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        mulai TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        selesai TIMESTAMP NULL,
+        jumlah_file INT DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ETL_Progress (
+        run_id VARCHAR(20) NOT NULL,
+        nama_file VARCHAR(255) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        pesan VARCHAR(255),
+        waktu TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (run_id, nama_file)
+    )
+    """
+]
+
+
+def mulai_run(cursor, mode):
+    # Milidetik ikut disertakan agar run beruntun dalam detik yang sama tetap unik dan terurut
+    sekarang = time.time()
+    run_id = time.strftime("%Y%m%d%H%M%S", time.localtime(sekarang)) + f"{int(sekarang * 1000) % 1000:03d}"
+    cursor.execute("INSERT INTO ETL_Run (run_id, mode, status) VALUES (%s, %s, 'berjalan')", (run_id, mode))
+    logging.info(f"🏁 [INFO]: Run {run_id} dimulai (mode {mode}).")
+    return run_id
+
+
+# Run terakhir yang belum selesai (proses mati di tengah jalan): (run_id, mode) atau None
+def run_terakhir(cursor):
+    cursor.execute("SELECT run_id, mode FROM ETL_Run WHERE status = 'berjalan' ORDER BY run_id DESC")
+    rows = cursor.fetchall()
+    return rows[0] if rows else None
+
+
+def file_selesai(cursor, run_id):
+    cursor.execute("SELECT nama_file FROM ETL_Progress WHERE run_id = %s AND status = 'selesai'", (run_id,))
+    return {nama_file for (nama_file,) in cursor.fetchall()}
+
+
+# Ditulis di transaksi batch yang sama dengan datanya, jadi hanya file yang benar-benar di-commit tercatat selesai
+def catat_file(backend, run_id, nama_file, status, pesan=None):
+    backend.upsert("ETL_Progress", {
+        "run_id": run_id, "nama_file": nama_file, "status": status,
+        "pesan": pesan[:255] if pesan else None
+    }, ["run_id", "nama_file"])
+
+
+# status 'gagal': ada batch yang tidak ter-commit, file-nya tercatat gagal di ETL_Progress
+def selesai_run(cursor, run_id, status="selesai"):
+    cursor.execute("SELECT COUNT(*) FROM ETL_Progress WHERE run_id = %s AND status = 'selesai'", (run_id,))
+    jumlah = cursor.fetchone()[0]
+    cursor.execute(
+        "UPDATE ETL_Run SET status = %s, selesai = CURRENT_TIMESTAMP, jumlah_file = %s WHERE run_id = %s",
+        (status, jumlah, run_id)
+    )
+    logging.info(f"🏁 [INFO]: Run {run_id} {status} ({jumlah} file di-commit).")
+    return jumlah
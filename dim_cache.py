@@ -0,0 +1,82 @@
+# dim_cache.py
+import logging
+
+
+# === Cache Kunci Dimensi (natural key -> surrogate key) ===
+class DimCache:
+    def __init__(self, cursor, table, id_col, key_cols, attr_cols=(), dialect="mysql"):
+        self.cursor = cursor
+        self.table = table
+        self.id_col = id_col
+        self.key_cols = tuple(key_cols)
+        self.attr_cols = tuple(attr_cols)
+        self.dialect = dialect
+        self.keys = {}
+
+    def _key(self, values):
+        # Dimensi dengan satu kolom kunci memakai nilai skalar, selainnya tuple
+        values = tuple(values)
+        return values[0] if len(values) == 1 else values
+
+    def _key_tuple(self, key):
+        return key if isinstance(key, tuple) else (key,)
+
+    def preload(self):
+        self.keys.clear()
+        cols = ", ".join((self.id_col,) + self.key_cols)
+        self.cursor.execute(f"SELECT {cols} FROM {self.table}")
+        for row in self.cursor.fetchall():
+            self.keys[self._key(row[1:])] = row[0]
+        logging.info(f"🗂️ [INFO]: Cache {self.table} dimuat ({len(self.keys)} anggota).")
+        return len(self.keys)
+
+    def get(self, key):
+        return self.keys.get(key)
+
+    # members: dict natural key -> tuple atribut; anggota baru di-insert sekaligus
+    def resolve(self, members):
+        baru = [key for key in members if key not in self.keys]
+        if baru:
+            rows = [self._key_tuple(key) + tuple(members[key]) for key in baru]
+            if self.dialect == "postgres":
+                self._insert_returning(rows)
+            elif self.dialect == "sqlite":
+                self._insert_per_baris(baru, rows)
+            else:
+                self._insert_lastrowid(baru, rows)
+        return {key: self.keys[key] for key in members}
+
+    def _insert_lastrowid(self, baru, rows):
+        cols = self.key_cols + self.attr_cols
+        placeholders = ", ".join(["%s"] * len(cols))
+        # mysql.connector menggabungkan executemany INSERT menjadi satu multi-row INSERT,
+        # sehingga lastrowid = id pertama dan id berikutnya berurutan (innodb_autoinc_lock_mode <= 1)
+        self.cursor.executemany(
+            f"INSERT INTO {self.table} ({', '.join(cols)}) VALUES ({placeholders})",
+            rows
+        )
+        first_id = self.cursor.lastrowid
+        for offset, key in enumerate(baru):
+            self.keys[key] = first_id + offset
+
+    def _insert_per_baris(self, baru, rows):
+        # SQLite in-process: insert per baris murah dan lastrowid selalu tepat
+        cols = self.key_cols + self.attr_cols
+        placeholders = ", ".join(["%s"] * len(cols))
+        for key, row in zip(baru, rows):
+            self.cursor.execute(f"INSERT INTO {self.table} ({', '.join(cols)}) VALUES ({placeholders})", row)
+            self.keys[key] = self.cursor.lastrowid
+
+    def _insert_returning(self, rows):
+        from psycopg2.extras import execute_values
+
+        cols = self.key_cols + self.attr_cols
+        returning = ", ".join((self.id_col,) + self.key_cols)
+        result = execute_values(
+            self.cursor,
+            f"INSERT INTO {self.table} ({', '.join(cols)}) VALUES %s RETURNING {returning}",
+            rows,
+            fetch=True
+        )
+        for row in result:
+            self.keys[self._key(row[1:])] = row[0]
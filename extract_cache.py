@@ -0,0 +1,109 @@
+# extract_cache.py
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from transkrip_parser import PARSER_VERSION
+
+CACHE_PATH = "extract_cache.sqlite"
+# Batas ukuran total record terkompresi sebelum entri lama (LRU) dibuang
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# === Cache Hasil Ekstraksi per Hash Isi File + Versi Parser ===
+class ExtractCache:
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES, parser_version=PARSER_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS extract_cache (
+                file_hash TEXT NOT NULL,
+                parser_version INTEGER NOT NULL,
+                record BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (file_hash, parser_version)
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, file_hash):
+        row = self.conn.execute(
+            "SELECT record FROM extract_cache WHERE file_hash = ? AND parser_version = ?",
+            (file_hash, self.parser_version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE extract_cache SET last_access = ? WHERE file_hash = ? AND parser_version = ?",
+            (time.time(), file_hash, self.parser_version)
+        )
+        return True, json.loads(zlib.decompress(row[0]))
+
+    def put(self, file_hash, record):
+        blob = zlib.compress(json.dumps(record).encode("utf-8"))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO extract_cache (file_hash, parser_version, record, size, last_access) VALUES (?, ?, ?, ?, ?)",
+            (file_hash, self.parser_version, blob, len(blob), time.time())
+        )
+
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM extract_cache").fetchone()[0]
+        dibuang = 0
+        if total > self.max_bytes:
+            rows = self.conn.execute("SELECT file_hash, parser_version, size FROM extract_cache ORDER BY last_access").fetchall()
+            for file_hash, parser_version, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute(
+                    "DELETE FROM extract_cache WHERE file_hash = ? AND parser_version = ?",
+                    (file_hash, parser_version)
+                )
+                total -= size
+                dibuang += 1
+        self.conn.commit()
+        return dibuang
+
+    # Buang entri dari versi parser lain (semua=True untuk mengosongkan cache)
+    def invalidate(self, semua=False):
+        if semua:
+            cur = self.conn.execute("DELETE FROM extract_cache")
+        else:
+            cur = self.conn.execute("DELETE FROM extract_cache WHERE parser_version <> ?", (self.parser_version,))
+        self.conn.commit()
+        return cur.rowcount
+
+    def close(self):
+        dibuang = self.evict()
+        logging.info(f"🗄️ [INFO]: Cache ekstraksi: {self.hits} hit, {self.misses} miss, {dibuang} entri dibuang.")
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kelola cache hasil ekstraksi transkrip")
+    parser.add_argument("--path", default=CACHE_PATH)
+    parser.add_argument("--invalidate", action="store_true", help="hapus entri dari versi parser lama")
+    parser.add_argument("--clear", action="store_true", help="kosongkan seluruh cache")
+    args = parser.parse_args()
+
+    cache = ExtractCache(args.path)
+    if args.clear or args.invalidate:
+        print(f"{cache.invalidate(semua=args.clear)} entri cache dihapus.")
+    cache.conn.close()
@@ -0,0 +1,216 @@
+# extract_pdf.py
+import logging
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import pdfplumber
+from transkrip_parser import parse_transkrip, Transkrip, TranskripStream
+from extract_cache import hash_file
+
+# resource hanya ada di Unix; tanpa itu kenaikan RSS per file tidak dilaporkan
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# pypdf opsional: tanpa pypdf semua file langsung diekstrak dengan pdfplumber
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+# Jumlah proses ekstraksi default = jumlah core
+EXTRACT_WORKERS = os.cpu_count() or 1
+# "stream": halaman diproses satu per satu (memori terbatas); "penuh": teks seluruh PDF digabung dulu
+EXTRACT_MODE = "stream"
+# Puncak memori per file (tracemalloc) hanya diukur bila ETL_TRACE_MEM=1: tracemalloc memperlambat
+# setiap alokasi Python di worker. Env var ikut diwarisi proses worker.
+# Tanpa itu yang selalu dicatat hanya kenaikan peak RSS proses (getrusage, satu syscall per file).
+TRACE_MEM = os.environ.get("ETL_TRACE_MEM") == "1"
+
+
+# Peak RSS proses ini dalam KiB (ru_maxrss Linux); None bila resource tidak tersedia
+def _maxrss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+
+
+# === Extract Teks dari PDF ===
+def ekstrak_teks(path):
+    with pdfplumber.open(path) as pdf:
+        return "\n".join(page.extract_text() for page in pdf.pages)
+
+
+# === Extract Teks per Halaman (cache layout pdfplumber dibuang setelah tiap halaman) ===
+def ekstrak_halaman(path):
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            page.flush_cache()
+            yield text
+
+
+# === Jalur cepat: text stream pypdf tanpa analisis layout per karakter ===
+def ekstrak_halaman_pypdf(path):
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+# === Backend Ekstraktor: nama -> generator teks per halaman, dicoba berurutan ===
+EXTRACTORS = {"pypdf": ekstrak_halaman_pypdf, "pdfplumber": ekstrak_halaman}
+EXTRACT_BACKENDS = ["pypdf", "pdfplumber"] if PdfReader else ["pdfplumber"]
+
+
+# === Stream baris mata kuliah selama halaman dibaca; header terkumpul di parser ===
+def stream_mata_kuliah(parser, halaman):
+    for text in halaman:
+        yield from parser.feed(text)
+    yield from parser.selesai()
+
+
+# === Halaman terukur: waktu ekstraksi teks dipisah dari parsing regex yang berjalan di sela-selanya ===
+def ukur_halaman(halaman, waktu):
+    halaman = iter(halaman)
+    while True:
+        start = time.perf_counter()
+        try:
+            text = next(halaman)
+        except StopIteration:
+            return
+        finally:
+            waktu["ekstrak"] += time.perf_counter() - start
+        waktu["halaman"] += 1
+        yield text
+
+
+def parse_stream(path, kode_prefix=None, backend="pdfplumber", waktu=None):
+    parser = TranskripStream(kode_prefix)
+    halaman = EXTRACTORS[backend](path)
+    if waktu is not None:
+        halaman = ukur_halaman(halaman, waktu)
+    return parser.hasil(stream_mata_kuliah(parser, halaman))
+
+
+def parse_backend(path, backend, mode=EXTRACT_MODE, waktu=None):
+    if mode == "stream":
+        return parse_stream(path, backend=backend, waktu=waktu)
+    halaman = EXTRACTORS[backend](path)
+    if waktu is not None:
+        halaman = ukur_halaman(halaman, waktu)
+    return parse_transkrip("\n".join(halaman))
+
+
+# === Worker: Extract + Transform satu file, opsional dengan puncak memori per file ===
+def ekstrak_file(path, mode=EXTRACT_MODE, backends=None, trace_mem=TRACE_MEM):
+    # Error dikembalikan sebagai string agar loader tetap mencatatnya per file, sesuai urutan
+    file = os.path.basename(path)
+    backends = backends or EXTRACT_BACKENDS
+    # backend = backend yang menghasilkan record dengan mata kuliah; gagal = backend yang error atau hasilnya kosong
+    # rss_naik: kenaikan peak RSS worker (KiB) selama file ini; 0 bila memori tidak melewati puncak sebelumnya
+    info = {"peak_mem": None, "rss_naik": None, "backend": None, "gagal": [], "waktu": {}, "tahap": {}, "baris": {}}
+    # Waktu tahap ekstrak (teks PDF) dan transform (regex) dijumlah lintas backend yang dicoba
+    waktu = {"ekstrak": 0.0, "halaman": 0}
+    start_file = time.perf_counter()
+    rss_awal = _maxrss()
+    if trace_mem:
+        tracemalloc.start()
+    try:
+        record = None
+        for i, backend in enumerate(backends):
+            start = time.perf_counter()
+            try:
+                record = parse_backend(path, backend, mode, waktu)
+            except Exception:
+                info["gagal"].append(backend)
+                # Jalur cepat yang gagal cukup jatuh ke backend berikutnya
+                if i == len(backends) - 1:
+                    raise
+                record = None
+                continue
+            finally:
+                info["waktu"][backend] = time.perf_counter() - start
+            # Fallback bila NRP/Nama tidak ditemukan atau tidak ada baris mata kuliah sama sekali
+            if record is not None and record.mata_kuliah:
+                info["backend"] = backend
+                break
+            info["gagal"].append(backend)
+        return file, record, None, info
+    except Exception as e:
+        return file, None, str(e), info
+    finally:
+        if trace_mem:
+            info["peak_mem"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if rss_awal is not None:
+            info["rss_naik"] = _maxrss() - rss_awal
+        info["tahap"] = {"ekstrak": waktu["ekstrak"], "transform": time.perf_counter() - start_file - waktu["ekstrak"]}
+        info["baris"] = {"ekstrak": waktu["halaman"]}
+        if record is not None:
+            info["baris"]["transform"] = len(record.mata_kuliah)
+
+
+# === Counter per Backend: jumlah percobaan, hit, gagal, dan total waktu ===
+class StatistikEkstraksi:
+    def __init__(self):
+        self.dicoba = {}
+        self.hit = {}
+        self.gagal = {}
+        self.waktu = {}
+
+    def catat(self, info):
+        for backend, detik in info["waktu"].items():
+            self.dicoba[backend] = self.dicoba.get(backend, 0) + 1
+            self.waktu[backend] = self.waktu.get(backend, 0.0) + detik
+        for backend in info["gagal"]:
+            self.gagal[backend] = self.gagal.get(backend, 0) + 1
+        if info["backend"]:
+            self.hit[info["backend"]] = self.hit.get(info["backend"], 0) + 1
+
+    def log(self):
+        for backend, dicoba in self.dicoba.items():
+            hit = self.hit.get(backend, 0)
+            logging.info(
+                f"⏱️ [INFO]: Backend {backend}: {hit}/{dicoba} file ({hit / dicoba:.0%} hit), "
+                f"{self.gagal.get(backend, 0)} gagal, "
+                f"total {self.waktu[backend]:.2f}s, rata-rata {self.waktu[backend] / dicoba * 1000:.1f} ms/file."
+            )
+
+
+# === Fan-out ke Process Pool, hasil dikonsumsi berurutan oleh satu loader ===
+def ekstrak_paralel(folder_path, pdf_files, workers=EXTRACT_WORKERS, cache=None, file_hashes=None,
+                    mode=EXTRACT_MODE, statistik=None):
+    paths = [os.path.join(folder_path, f) for f in pdf_files]
+    if file_hashes is not None:
+        hashes = [file_hashes[f] for f in pdf_files]
+    else:
+        hashes = [hash_file(path) for path in paths] if cache else [None] * len(paths)
+
+    # Cache hit tidak pernah menyentuh ekstraktor; hanya miss yang dikirim ke worker
+    cached = {}
+    if cache:
+        for path, file_hash in zip(paths, hashes):
+            hit, record = cache.get(file_hash)
+            if hit:
+                cached[path] = Transkrip.from_dict(record)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(cached) < len(paths) else None
+    try:
+        futures = {}
+        if executor:
+            futures = {path: executor.submit(ekstrak_file, path, mode) for path in paths if path not in cached}
+
+        for path, file_hash in zip(paths, hashes):
+            if path in cached:
+                yield os.path.basename(path), cached[path], None, None
+                continue
+
+            file, record, error, info = futures[path].result() if executor else ekstrak_file(path, mode)
+            if statistik:
+                statistik.catat(info)
+            if cache and not error:
+                cache.put(file_hash, record.to_dict() if record else None)
+            yield file, record, error, info
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
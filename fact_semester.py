@@ -0,0 +1,108 @@
+# fact_semester.py
+import logging
+from bulk_loader import BulkLoader
+from ipk_numpy import np, ambil_fakta, hitung_semester
+
+# Batas jumlah id dalam satu klausa IN agar query tetap wajar
+CHUNK_MAHASISWA = 500
+
+SEMESTER_COLUMNS = ["id_mahasiswa", "id_waktu", "semester_seq", "id_nilai", "ips", "ipk", "sks", "sks_lulus"]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# === Hitung IPS & IPK dari baris fakta per (mahasiswa, semester) ===
+def hitung_ips_ipk(rows):
+    # rows: (id_mahasiswa, id_mk, id_waktu, semester_seq, sks, bobot, id_nilai, lulus)
+    # terurut per mahasiswa lalu semester_seq (kronologis, bukan urutan insert id_waktu).
+    # IPS menghitung semua MK di semester itu; IPK hanya nilai terbaik tiap MK sampai semester itu.
+    hasil = []
+    grup = None
+    terbaik = {}
+    total_sks_kumulatif = 0
+    total_bobot_kumulatif = 0
+
+    def tutup(grup):
+        id_mahasiswa, semester_seq, id_waktu, total_sks, total_bobot, id_nilai, sks_lulus = grup
+        ips = round(total_bobot / total_sks, 2) if total_sks > 0 else 0.0
+        ipk = round(total_bobot_kumulatif / total_sks_kumulatif, 2) if total_sks_kumulatif > 0 else 0.0
+        hasil.append((id_mahasiswa, id_waktu, semester_seq, id_nilai, ips, ipk, total_sks, sks_lulus))
+
+    for id_mahasiswa, id_mk, id_waktu, semester_seq, sks, bobot, id_nilai, lulus in rows:
+        bobot = float(bobot)
+        if grup is None or grup[:2] != [id_mahasiswa, semester_seq]:
+            if grup is not None:
+                tutup(grup)
+            if grup is None or grup[0] != id_mahasiswa:
+                terbaik = {}
+                total_sks_kumulatif = 0
+                total_bobot_kumulatif = 0
+            grup = [id_mahasiswa, semester_seq, id_waktu, 0, 0.0, id_nilai, 0]
+
+        grup[3] += sks
+        grup[4] += sks * bobot
+        grup[5] = max(grup[5], id_nilai)
+        grup[6] += sks * lulus
+
+        # Update kumulatif untuk IPK: SKS MK dihitung sekali, bobot naik bila percobaan ini lebih baik
+        if id_mk not in terbaik:
+            terbaik[id_mk] = (sks, bobot)
+            total_sks_kumulatif += sks
+            total_bobot_kumulatif += sks * bobot
+        elif bobot > terbaik[id_mk][1]:
+            sks_mk, bobot_lama = terbaik[id_mk]
+            terbaik[id_mk] = (sks_mk, bobot)
+            total_bobot_kumulatif += sks_mk * (bobot - bobot_lama)
+
+    if grup is not None:
+        tutup(grup)
+    return hasil
+
+
+# Jalur tanpa numpy: baris fakta diambil terurut, agregat semester & kumulatif dihitung di Python;
+# nilai dominan = id_nilai terbesar seperti pada versi per-baris
+def _hitung_sql(cursor, chunk=None):
+    where = f"WHERE id_mahasiswa IN ({', '.join(['%s'] * len(chunk))})" if chunk is not None else ""
+    cursor.execute(f"""
+        SELECT id_mahasiswa, id_mk, id_waktu, semester_ordinal, sks, bobot, id_nilai, lulus
+        FROM Fact_Nilai_MK
+        {where}
+        ORDER BY id_mahasiswa, semester_ordinal, percobaan
+    """, tuple(chunk or ()))
+    return hitung_ips_ipk(cursor.fetchall())
+
+
+def _hitung(cursor, chunk=None):
+    if np is not None:
+        return hitung_semester(ambil_fakta(cursor, chunk))
+    return _hitung_sql(cursor, chunk)
+
+
+# === Refresh Fact_Nilai_Semester: mahasiswa yang berubah, atau seluruhnya (id_mahasiswa_list=None) ===
+def refresh_fact_semester(cursor, id_mahasiswa_list=None, dialect="mysql"):
+    loader = BulkLoader(cursor, "Fact_Nilai_Semester", SEMESTER_COLUMNS, dialect=dialect)
+
+    if id_mahasiswa_list is None:
+        # Bangun ulang penuh: fakta diambil sekali, lalu ditulis dengan bulk insert/COPY
+        cursor.execute("DELETE FROM Fact_Nilai_Semester")
+        rows = _hitung(cursor)
+        loader.extend(rows)
+        loader.flush()
+        logging.info(f"📊 [INFO]: Fact_Nilai_Semester dibangun ulang penuh ({len(rows)} baris, "
+                     f"{'numpy' if np is not None else 'sql'}).")
+        return len(rows)
+
+    ids = sorted(set(id_mahasiswa_list))
+    total = 0
+    for chunk in _chunks(ids, CHUNK_MAHASISWA):
+        rows = _hitung(cursor, chunk)
+        cursor.execute(f"DELETE FROM Fact_Nilai_Semester WHERE id_mahasiswa IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        loader.extend(rows)
+        total += len(rows)
+    loader.flush()
+
+    logging.info(f"📊 [INFO]: Fact_Nilai_Semester diperbarui untuk {len(ids)} mahasiswa ({total} baris).")
+    return total
@@ -0,0 +1,293 @@
+# ingest_daemon.py
+import os
+import time
+import signal
+import asyncio
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from backend import BACKENDS
+from pipeline import LoadETL, MODEL, FOLDER_TRANSKRIP, EXTRACT_CACHE_PATH, buat_backend
+from transkrip_parser import Transkrip
+from extract_pdf import ekstrak_file, EXTRACT_WORKERS, EXTRACT_MODE
+from extract_cache import ExtractCache, hash_file
+from load_manifest import hitung_delta
+from instrumentasi import Instrumentasi, hook_json, hook_prometheus, RINGKASAN_PATH
+
+# inotify hanya ada di Linux dan opsional; tanpa itu folder dipantau dengan polling
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+# Interval polling (detik); file baru dianggap siap setelah ukuran & mtime stabil satu putaran
+POLL_INTERVAL = 2.0
+
+# Batas antrian file -> ekstraksi dan hasil -> load; antrian penuh menahan produsennya (backpressure)
+MAX_ANTRIAN = 64
+
+# Micro-batch load: commit setelah MICRO_BATCH transkrip atau BATCH_TIMEOUT detik, mana yang lebih dulu
+MICRO_BATCH = 16
+BATCH_TIMEOUT = 1.0
+
+
+def _scan(folder_path):
+    tanda = {}
+    for entry in os.scandir(folder_path):
+        if entry.name.endswith(".pdf") and entry.is_file():
+            stat = entry.stat()
+            tanda[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return tanda
+
+
+# === Daemon Ingest: pantau folder -> ekstraksi di process pool -> load micro-batch ===
+class IngestDaemon:
+    def __init__(self, etl, folder_path=FOLDER_TRANSKRIP, workers=EXTRACT_WORKERS, mode=EXTRACT_MODE,
+                 polling=False, interval=POLL_INTERVAL):
+        self.etl = etl
+        self.folder_path = folder_path
+        self.workers = workers
+        self.mode = mode
+        self.polling = polling or INotify is None
+        self.interval = interval
+        # Nama file yang sudah antre ekstraksi; event berulang untuk file yang sama tidak diantrekan lagi
+        self.menunggu = set()
+        self.jumlah_batch = 0
+
+    async def kirim(self, nama, dihapus=False):
+        if dihapus:
+            await self.antrian_hasil.put(("hapus", nama))
+        elif nama not in self.menunggu:
+            self.menunggu.add(nama)
+            await self.antrian_file.put(nama)
+
+    # === Sumber event: inotify (IN_CLOSE_WRITE = file selesai ditulis) ===
+    def _siapkan_inotify(self):
+        self.inotify = INotify()
+        self.inotify.add_watch(
+            self.folder_path, flags.CLOSE_WRITE | flags.MOVED_TO | flags.DELETE | flags.MOVED_FROM
+        )
+
+    async def _pantau_inotify(self):
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        loop.add_reader(self.inotify.fileno(), lambda: events.put_nowait(self.inotify.read(timeout=0)))
+        try:
+            while not self.stop.is_set():
+                try:
+                    batch = await asyncio.wait_for(events.get(), self.interval)
+                except asyncio.TimeoutError:
+                    continue
+                for event in batch:
+                    if event.name.endswith(".pdf"):
+                        await self.kirim(event.name, bool(event.mask & (flags.DELETE | flags.MOVED_FROM)))
+        finally:
+            loop.remove_reader(self.inotify.fileno())
+            self.inotify.close()
+
+    # === Sumber event: polling (fallback tanpa inotify) ===
+    def _siapkan_polling(self):
+        self.terlihat = _scan(self.folder_path)
+
+    async def _pantau_polling(self):
+        loop = asyncio.get_running_loop()
+        calon = {}
+        while not self.stop.is_set():
+            sekarang = await loop.run_in_executor(None, _scan, self.folder_path)
+            for nama, tanda in sekarang.items():
+                if self.terlihat.get(nama) == tanda:
+                    continue
+                # File yang masih disalin berubah ukuran/mtime; tunggu sampai stabil satu putaran
+                if calon.get(nama) == tanda:
+                    self.terlihat[nama] = tanda
+                    del calon[nama]
+                    await self.kirim(nama)
+                else:
+                    calon[nama] = tanda
+            for nama in [nama for nama in self.terlihat if nama not in sekarang]:
+                del self.terlihat[nama]
+                await self.kirim(nama, dihapus=True)
+            try:
+                await asyncio.wait_for(self.stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # Dijalankan di thread database (pemilik manifest & cache): "sama" bila isi file tidak berubah,
+    # "cache" beserta record bila hasil ekstraksi sudah ada, selain itu "ekstrak"
+    def _periksa(self, nama, file_hash):
+        if self.etl.manifest.get(nama, (None,))[0] == file_hash:
+            return "sama", None
+        hit, record = self.cache.get(file_hash)
+        if hit:
+            return "cache", Transkrip.from_dict(record)
+        return "ekstrak", None
+
+    # === Ekstraksi: hash di thread pool, cek manifest/cache di thread database, parsing PDF di process pool ===
+    async def _ekstraktor(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            nama = await self.antrian_file.get()
+            if nama is None:
+                return
+            self.menunggu.discard(nama)
+            path = os.path.join(self.folder_path, nama)
+            try:
+                file_hash = await loop.run_in_executor(None, hash_file, path)
+            except FileNotFoundError:
+                continue
+            # Event tanpa perubahan isi (touch, salin ulang file yang sama) tidak dimuat ulang
+            status, record = await loop.run_in_executor(self.db, self._periksa, nama, file_hash)
+            if status == "sama":
+                continue
+            if status == "cache":
+                await self.antrian_hasil.put(("muat", nama, file_hash, record, None, None))
+                continue
+            file, record, error, info = await loop.run_in_executor(self.proses, ekstrak_file, path, self.mode)
+            await self.antrian_hasil.put(("muat", nama, file_hash, record, error, info))
+
+    # === Load: kumpulkan micro-batch lalu muat di thread database tunggal ===
+    async def _loader(self):
+        loop = asyncio.get_running_loop()
+        selesai = False
+        while not selesai:
+            item = await self.antrian_hasil.get()
+            if item is None:
+                return
+            batch = [item]
+            batas = loop.time() + BATCH_TIMEOUT
+            while len(batch) < MICRO_BATCH:
+                sisa = batas - loop.time()
+                if sisa <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.antrian_hasil.get(), sisa)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    selesai = True
+                    break
+                batch.append(item)
+            await loop.run_in_executor(self.db, self._muat_batch, batch)
+
+    def _masih_berlaku(self, nama, file_hash):
+        try:
+            berlaku = hash_file(os.path.join(self.folder_path, nama)) == file_hash
+        except FileNotFoundError:
+            logging.info(f"🗑️ [INFO]: {nama} sudah dihapus sebelum dimuat, hasil ekstraksi dibuang.")
+            return False
+        if not berlaku:
+            logging.info(f"⏭️ [INFO]: {nama} berubah lagi sebelum dimuat, hasil ekstraksi lama dibuang.")
+        return berlaku
+
+    def _muat_batch(self, batch):
+        start = time.perf_counter()
+        dimuat = 0
+        for item in batch:
+            if item[0] == "hapus":
+                self.etl.hapus_file([item[1]])
+                continue
+            _, nama, file_hash, record, error, info = item
+            # File yang sama bisa diekstrak dua kali bersamaan (ditulis ulang saat ekstraksi masih berjalan) dan
+            # hasilnya tiba tidak berurutan; hanya hasil yang hash-nya masih sama dengan isi file di disk yang dimuat
+            if not self._masih_berlaku(nama, file_hash):
+                continue
+            # info None: record berasal dari cache ekstraksi
+            if not error and info is not None:
+                self.cache.put(file_hash, record.to_dict() if record else None)
+            if self.etl.muat(nama, file_hash, record, error, info):
+                dimuat += 1
+        self.etl.commit()
+        # Metrik kumulatif sejak daemon hidup (mis. untuk textfile collector Prometheus)
+        self.etl.ukur.ekspor()
+        self.jumlah_batch += 1
+        logging.info(
+            f"⚡ [INFO]: Micro-batch {self.jumlah_batch}: {dimuat}/{len(batch)} transkrip dimuat "
+            f"dalam {time.perf_counter() - start:.2f}s."
+        )
+
+    def _buka(self):
+        self.etl.buka()
+        self.etl.buat_index()
+        # Cache ekstraksi (SQLite) dibuat dan dipakai hanya di thread database
+        self.cache = ExtractCache(EXTRACT_CACHE_PATH)
+
+    def _tutup(self):
+        self.cache.close()
+        self.etl.akhiri()
+        self.etl.ukur.log()
+        self.etl.ukur.ekspor()
+        self.etl.tutup()
+
+    async def jalankan(self):
+        loop = asyncio.get_running_loop()
+        self.stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop.set)
+
+        self.antrian_file = asyncio.Queue(MAX_ANTRIAN)
+        self.antrian_hasil = asyncio.Queue(MAX_ANTRIAN)
+        self.db = ThreadPoolExecutor(max_workers=1)
+        self.proses = ProcessPoolExecutor(max_workers=self.workers)
+        await loop.run_in_executor(self.db, self._buka)
+
+        ekstraktor = [asyncio.create_task(self._ekstraktor()) for _ in range(self.workers)]
+        loader = asyncio.create_task(self._loader())
+
+        # Pemantau dipasang sebelum folder dibaca, supaya file yang datang saat catch-up tidak terlewat
+        if self.polling:
+            self._siapkan_polling()
+            pantau = self._pantau_polling
+        else:
+            self._siapkan_inotify()
+            pantau = self._pantau_inotify
+        logging.info(f"👀 [INFO]: Memantau '{self.folder_path}' dengan {'polling' if self.polling else 'inotify'}.")
+
+        # === Catch-up: file yang berubah selama daemon mati ===
+        file_hashes = await loop.run_in_executor(None, lambda: {
+            nama: hash_file(os.path.join(self.folder_path, nama)) for nama in _scan(self.folder_path)
+        })
+        delta = hitung_delta(self.etl.manifest, file_hashes)
+        for nama in delta["dihapus"]:
+            await self.kirim(nama, dihapus=True)
+        for nama in delta["baru"] + delta["berubah"]:
+            await self.kirim(nama)
+
+        await pantau()
+
+        # === Berhenti: kuras antrian, commit terakhir, tutup run ===
+        logging.info("🛑 [INFO]: Daemon berhenti, menyelesaikan antrian.")
+        for _ in ekstraktor:
+            await self.antrian_file.put(None)
+        await asyncio.gather(*ekstraktor)
+        await self.antrian_hasil.put(None)
+        await loader
+        await loop.run_in_executor(self.db, self._tutup)
+        self.proses.shutdown()
+        self.db.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daemon ingest: muat PDF transkrip baru/berubah secara terus-menerus")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="sqlite")
+    parser.add_argument("--db", default="dw_transkrip.sqlite", help="nama database, atau path file untuk sqlite")
+    parser.add_argument("--model", choices=sorted(MODEL), default="2fact")
+    parser.add_argument("--folder", default=FOLDER_TRANSKRIP)
+    parser.add_argument("--polling", action="store_true", help="pakai polling walaupun inotify tersedia")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS)
+    parser.add_argument("--summary", default=RINGKASAN_PATH, help="file ringkasan run (JSON)")
+    parser.add_argument("--prometheus", help="tulis metrik tahap ETL dalam format teks Prometheus ke file ini")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        handlers=[logging.FileHandler("ingest_daemon.log", encoding="utf-8"), logging.StreamHandler()],
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    # Daemon selalu incremental: database dipakai ulang dan tiap file menggantikan data mahasiswanya
+    # Daemon berjalan lama: hanya total per tahap yang disimpan, tanpa rincian per file
+    hooks = [hook_json(args.summary)] + ([hook_prometheus(args.prometheus)] if args.prometheus else [])
+    etl = LoadETL(buat_backend(args.backend, args.db), args.model, incremental=True, commit_every=MICRO_BATCH,
+                  instrumentasi=Instrumentasi(hooks, per_file=False))
+    daemon = IngestDaemon(etl, args.folder, workers=args.workers, polling=args.polling, interval=args.interval)
+    asyncio.run(daemon.jalankan())
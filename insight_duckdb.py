@@ -0,0 +1,106 @@
+# insight_duckdb.py
+import os
+import time
+import argparse
+import logging
+import duckdb
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+from lakehouse import LAKEHOUSE_PATH, TABLES, TABEL_PER_MAHASISWA, baca_manifest
+from agregat import AGREGAT
+from insight_sql import baca_insight
+
+OUTPUT_DIR = "insight_output"
+
+
+# Connection string ekstensi mysql DuckDB dari konfigurasi DW (DB_NAME/DB_CONFIG di ETL_FINAL.py)
+def dw_attach(db_name, db_config):
+    config = {**db_config, "database": db_name}
+    return " ".join(f"{k}={v}" for k, v in config.items() if v not in (None, ""))
+
+
+# === Sumber Data: view di atas file Parquet lakehouse ===
+def buka_lakehouse(con, root=LAKEHOUSE_PATH):
+    manifest = baca_manifest(root)
+    dihapus = manifest["dihapus_mahasiswa"]
+
+    for table, spec in TABLES.items():
+        files = manifest["tables"].get(table, {}).get("files", [])
+        if not files:
+            con.register(table, spec["schema"].empty_table())
+            continue
+
+        daftar = ", ".join("'" + os.path.join(root, f).replace("'", "''") + "'" for f in files)
+        sql = f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM read_parquet([{daftar}], hive_partitioning = {bool(spec['partisi'])})"
+        if table in TABEL_PER_MAHASISWA and dihapus:
+            sql += f" WHERE id_mahasiswa NOT IN ({', '.join(str(int(i)) for i in dihapus)})"
+        con.execute(sql)
+
+    # Tabel agregat DW tidak diekspor; di lakehouse cukup jadi view di atas fakta
+    for table, (_, select_sql) in AGREGAT.items():
+        con.execute(f"CREATE OR REPLACE VIEW {table} AS " + select_sql.format(where=""))
+
+
+# === Sumber Data: tabel DW MariaDB dibaca langsung lewat ekstensi mysql (tanpa ekspor) ===
+def buka_dw(con, attach):
+    con.execute("INSTALL mysql")
+    con.execute("LOAD mysql")
+    con.execute(f"ATTACH '{attach}' AS dw (TYPE mysql, READ_ONLY)")
+    con.execute("USE dw")
+
+
+# === Jalankan insight satu per satu, hasil sebagai tabel Arrow beserta waktunya ===
+def jalankan_insight(con, insights, nomor=None):
+    for no in sorted(nomor or insights):
+        judul, sql = insights[no]
+        start = time.perf_counter()
+        # Tabel Arrow utuh; .arrow() pada DuckDB baru mengembalikan RecordBatchReader
+        hasil = con.execute(sql).fetch_arrow_table()
+        yield no, judul, hasil, time.perf_counter() - start
+
+
+def simpan_hasil(hasil, output_dir, no, fmt):
+    os.makedirs(output_dir, exist_ok=True)
+    if fmt == "arrow":
+        path = os.path.join(output_dir, f"insight_{no:02d}.arrow")
+        feather.write_feather(hasil, path)
+    else:
+        path = os.path.join(output_dir, f"insight_{no:02d}.csv")
+        pa_csv.write_csv(hasil, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan insight_transkrip.sql dengan DuckDB in-process")
+    parser.add_argument("--sumber", choices=["lakehouse", "dw"], default="lakehouse")
+    parser.add_argument("--path", default=LAKEHOUSE_PATH, help="folder lakehouse Parquet")
+    parser.add_argument("--insight", type=int, nargs="*", help="nomor insight (default: semua)")
+    parser.add_argument("--format", choices=["csv", "arrow"], default="csv")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    insights = baca_insight()
+    tidak_dikenal = sorted(set(args.insight or []) - set(insights))
+    if tidak_dikenal:
+        parser.error(f"insight tidak dikenal: {', '.join(map(str, tidak_dikenal))} (tersedia {min(insights)}-{max(insights)})")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    con = duckdb.connect()
+    con.execute(f"SET threads = {args.threads}")
+    if args.sumber == "dw":
+        # Konfigurasi DW yang sama dengan ETL_FINAL.py, seperti lakehouse.py/schema.py
+        from ETL_FINAL import DB_NAME, DB_CONFIG
+        buka_dw(con, dw_attach(DB_NAME, DB_CONFIG))
+    else:
+        buka_lakehouse(con, args.path)
+
+    total = 0.0
+    for no, judul, hasil, detik in jalankan_insight(con, insights, args.insight):
+        total += detik
+        path = simpan_hasil(hasil, args.output, no, args.format)
+        logging.info(f"📊 [INFO]: Insight {no} ({judul}): {hasil.num_rows} baris, {detik * 1000:.1f} ms -> {path}")
+
+    con.close()
+    print(f"✅ {len(args.insight or insights)} insight selesai dalam {total:.2f}s. Hasil di {args.output}/")
@@ -0,0 +1,22 @@
+# insight_sql.py
+import re
+
+INSIGHT_SQL = "insight_transkrip.sql"
+
+HEADER_PATTERN = re.compile(r"^-- Insight (\d+)\s*:\s*(.*)$", re.MULTILINE)
+
+
+# === Pecah insight_transkrip.sql menjadi {nomor: (judul, sql)} ===
+def baca_insight(path=INSIGHT_SQL):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    headers = list(HEADER_PATTERN.finditer(text))
+    insights = {}
+    for i, m in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        sql = text[m.end():end].strip().rstrip(";").strip()
+        # Insight tanpa query (masih placeholder) dilewati
+        if sql:
+            insights[int(m.group(1))] = (m.group(2).strip(), sql)
+    return insights
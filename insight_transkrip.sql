@@ -1,80 +1,61 @@
+-- Rasio dari tabel Agg_* dikali 1.0: di SQLite kolom DECIMAL yang bernilai bulat tersimpan INTEGER (pembagian bulat)
+
 -- Insight 1: Rata-rata IPK seluruh mahasiswa
+-- IPK dari percobaan terbaik tiap MK (MK yang diulang tidak dihitung dua kali)
 SELECT
-    AVG(total_bobot / total_sks) AS rata_rata_ipk
-FROM (
-    SELECT m.id_mahasiswa,
-           SUM(n.bobot * mk.sks) AS total_bobot,
-           SUM(mk.sks) AS total_sks
-    FROM Fact_Nilai_MK f
-    JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-    JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-    JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-    GROUP BY m.id_mahasiswa
-) AS ipk_mahasiswa;
+    AVG(1.0 * total_bobot_terbaik / total_sks_terbaik) AS rata_rata_ipk
+FROM Agg_Mahasiswa;
 
 -- Insight 2: Top 10 Mahasiswa Berdasarkan IPK
 SELECT
     m.nrp, m.nama,
-    ROUND(SUM(n.bobot * mk.sks) / SUM(mk.sks), 2) AS ipk
-FROM Fact_Nilai_MK f
-JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY m.id_mahasiswa
+    ROUND(1.0 * a.total_bobot_terbaik / a.total_sks_terbaik, 2) AS ipk
+FROM Agg_Mahasiswa a
+JOIN Dim_Mahasiswa m ON a.id_mahasiswa = m.id_mahasiswa
 ORDER BY ipk DESC
 LIMIT 10;
 
 -- Insight 3: Distribusi nilai huruf
 SELECT
-    huruf,
-    COUNT(*) AS jumlah
-FROM Dim_Nilai n
-JOIN Fact_Nilai_MK f ON f.id_nilai = n.id_nilai
-GROUP BY huruf
+    n.huruf,
+    a.jumlah
+FROM Agg_Nilai a
+JOIN Dim_Nilai n ON a.id_nilai = n.id_nilai
 ORDER BY jumlah DESC;
 
 -- Insight 4: Top 5 MK nilai rata-rata terendah
 SELECT
     mk.kode_mk, mk.nama_mk,
-    ROUND(AVG(n.bobot), 2) AS rata_rata_bobot
-FROM Fact_Nilai_MK f
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY mk.id_mk
+    ROUND(1.0 * a.total_bobot_mentah / a.jumlah, 2) AS rata_rata_bobot
+FROM Agg_MataKuliah a
+JOIN Dim_MataKuliah mk ON a.id_mk = mk.id_mk
 ORDER BY rata_rata_bobot ASC
 LIMIT 5;
 
 -- Insight 5: Top 5 MK nilai rata-rata tertinggi
 SELECT
     mk.kode_mk, mk.nama_mk,
-    ROUND(AVG(n.bobot), 2) AS rata_rata_bobot
-FROM Fact_Nilai_MK f
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY mk.id_mk
+    ROUND(1.0 * a.total_bobot_mentah / a.jumlah, 2) AS rata_rata_bobot
+FROM Agg_MataKuliah a
+JOIN Dim_MataKuliah mk ON a.id_mk = mk.id_mk
 ORDER BY rata_rata_bobot DESC
 LIMIT 5;
 
 -- Insight 6: Nilai rata-rata semester gasal vs genap
 SELECT
     w.semester,
-    ROUND(SUM(n.bobot * mk.sks) / SUM(mk.sks), 2) AS rata_rata_nilai
-FROM Fact_Nilai_MK f
-JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
+    ROUND(1.0 * SUM(a.total_bobot) / SUM(a.total_sks), 2) AS rata_rata_nilai
+FROM Agg_Waktu a
+JOIN Dim_Waktu w ON a.id_waktu = w.id_waktu
 GROUP BY w.semester;
 
 -- Insight 7: Rata-rata IPS per semester
 SELECT
     w.tahun, w.semester,
-    ROUND(SUM(n.bobot * mk.sks) / SUM(mk.sks), 2) AS rata_ips
-FROM Fact_Nilai_MK f
-JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY w.tahun, w.semester
-ORDER BY w.tahun, w.semester;
+    ROUND(1.0 * a.total_bobot / a.total_sks, 2) AS rata_ips
+FROM Agg_Waktu a
+JOIN Dim_Waktu w ON a.id_waktu = w.id_waktu
+ORDER BY w.semester_seq;
 
 -- Insight 8: Mata kuliah paling sering diambil
 SELECT
@@ -82,48 +63,39 @@ SELECT
     COUNT(*) AS frekuensi_pengambilan
 FROM Fact_Nilai_MK f
 JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-GROUP BY mk.id_mk
+GROUP BY mk.id_mk, mk.kode_mk, mk.nama_mk
 ORDER BY frekuensi_pengambilan DESC
 LIMIT 5;
 
 -- Insight 9: Total SKS lulus per mahasiswa
+-- MK yang lulus lebih dari sekali (perbaikan nilai) dihitung sekali
 SELECT
     m.nrp, m.nama,
-    SUM(mk.sks) AS total_sks_lulus
-FROM Fact_Nilai_MK f
-JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-WHERE n.bobot >= 2.0
-GROUP BY m.id_mahasiswa;
+    a.sks_lulus_terbaik AS total_sks_lulus
+FROM Agg_Mahasiswa a
+JOIN Dim_Mahasiswa m ON a.id_mahasiswa = m.id_mahasiswa
+WHERE a.jumlah_mk_lulus > 0;
 
 -- Insight 10: Mahasiswa belum lulus suatu MK (nilai D/E tanpa perbaikan)
-SELECT DISTINCT
+-- Percobaan terbaik tidak lulus = belum pernah lulus di percobaan mana pun
+SELECT
     m.nrp, m.nama,
     mk.kode_mk, mk.nama_mk
-FROM Fact_Nilai_MK f1
-JOIN Dim_Mahasiswa m ON f1.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_MataKuliah mk ON f1.id_mk = mk.id_mk
-JOIN Dim_Nilai n1 ON f1.id_nilai = n1.id_nilai
-WHERE n1.huruf IN ('D', 'E')
-  AND NOT EXISTS (
-    SELECT 1 FROM Fact_Nilai_MK f2
-    JOIN Dim_Nilai n2 ON f2.id_nilai = n2.id_nilai
-    WHERE f2.id_mahasiswa = f1.id_mahasiswa
-      AND f2.id_mk = f1.id_mk
-      AND n2.huruf NOT IN ('D', 'E')
-  );
+FROM Fact_Nilai_MK f
+JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
+JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
+WHERE f.percobaan_terbaik = 1 AND f.lulus = 0;
 
 -- Insight 11: Mahasiswa yang mengulang MK (ambil MK lebih dari 1x)
+-- Nomor percobaan terakhir = jumlah pengambilan MK tersebut
 SELECT
     m.nrp, m.nama,
     mk.kode_mk, mk.nama_mk,
-    COUNT(*) AS kali_diambil
+    f.percobaan AS kali_diambil
 FROM Fact_Nilai_MK f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
 JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-GROUP BY m.id_mahasiswa, mk.id_mk
-HAVING COUNT(*) > 1
+WHERE f.percobaan_terakhir = 1 AND f.percobaan > 1
 ORDER BY kali_diambil DESC;
 
 -- Insight 12: Rata-rata IP tahap persiapan vs sarjana
@@ -148,12 +120,10 @@ LIMIT 5;
 -- Insight 15: Kelulusan Mahasiswa per Mata Kuliah
 SELECT
     mk.kode_mk, mk.nama_mk,
-    SUM(CASE WHEN n.huruf NOT IN ('D','E') THEN 1 ELSE 0 END) AS lulus,
-    SUM(CASE WHEN n.huruf IN ('D','E') THEN 1 ELSE 0 END) AS tidak_lulus
-FROM Fact_Nilai_MK f
-JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY mk.id_mk;
+    a.lulus,
+    a.tidak_lulus
+FROM Agg_MataKuliah a
+JOIN Dim_MataKuliah mk ON a.id_mk = mk.id_mk;
 
 -- Insight 16: Jalur masuk mahasiswa (berdasarkan NRP)
 SELECT
@@ -189,33 +159,29 @@ ORDER BY rata_rata_ipk DESC;
 SELECT
     m.nrp,
     m.nama,
-    ROUND(AVG(n.bobot), 2) AS rata_rata_bobot_nilai
-FROM Fact_Nilai_MK f
-JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY m.id_mahasiswa
+    ROUND(1.0 * a.total_bobot_mentah / a.jumlah_mk, 2) AS rata_rata_bobot_nilai
+FROM Agg_Mahasiswa a
+JOIN Dim_Mahasiswa m ON a.id_mahasiswa = m.id_mahasiswa
 ORDER BY rata_rata_bobot_nilai DESC;
 
 -- Insight 19: Jumlah semester yang diikuti setiap mahasiswa
 SELECT
     m.nrp,
     m.nama,
-    COUNT(DISTINCT CONCAT(w.tahun, '-', w.semester)) AS jumlah_semester
+    COUNT(DISTINCT f.semester_ordinal) AS jumlah_semester
 FROM Fact_Nilai_MK f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-GROUP BY m.id_mahasiswa
+GROUP BY m.id_mahasiswa, m.nrp, m.nama
 ORDER BY jumlah_semester DESC;
 
 -- Insight 20: Nilai terendah yang pernah dicapai tiap mahasiswa
 SELECT
     m.nrp,
     m.nama,
-    MIN(n.bobot) AS nilai_terendah
+    MIN(f.bobot) AS nilai_terendah
 FROM Fact_Nilai_MK f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai
-GROUP BY m.id_mahasiswa
+GROUP BY m.id_mahasiswa, m.nrp, m.nama
 ORDER BY nilai_terendah ASC;
 
 -- Insight 21  : Tren IPS per Mahasiswa
@@ -227,7 +193,7 @@ SELECT
 FROM Fact_Nilai_Semester f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
 JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-ORDER BY m.nrp, w.tahun, w.semester;
+ORDER BY m.nrp, f.semester_seq;
 
 -- Insight 22  : Mahasiswa dengan Kenaikan (DESC)/Penurunan(ASC) IPS Terbesar Antar Semester
 SELECT
@@ -241,11 +207,8 @@ FROM (
         m.nrp,
         m.nama,
         CONCAT(w.tahun, '-', w.semester) AS semester_sekarang,
-        CONCAT(LAG(w.tahun) OVER (PARTITION BY m.id_mahasiswa ORDER BY w.tahun, w.semester),
-               '-', 
-               LAG(w.semester) OVER (PARTITION BY m.id_mahasiswa ORDER BY w.tahun, w.semester)
-        ) AS semester_sebelumnya,
-        f.ips - LAG(f.ips) OVER (PARTITION BY m.id_mahasiswa ORDER BY w.tahun, w.semester) AS kenaikan_ips
+        LAG(CONCAT(w.tahun, '-', w.semester)) OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq) AS semester_sebelumnya,
+        f.ips - LAG(f.ips) OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq) AS kenaikan_ips
     FROM Fact_Nilai_Semester f
     JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
     JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
@@ -262,7 +225,7 @@ SELECT
     MAX(f.ipk) AS ipk_tertinggi
 FROM Fact_Nilai_Semester f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
-GROUP BY m.id_mahasiswa
+GROUP BY m.id_mahasiswa, m.nrp, m.nama
 HAVING MIN(f.ipk) >= 3.5;
 
 -- Insight 24  : Rata-rata IPK seluruh mahasiswa semester akhir dibanding awal
@@ -272,11 +235,10 @@ SELECT
 FROM (
     SELECT
         f.id_mahasiswa,
-        FIRST_VALUE(f.ipk) OVER (PARTITION BY f.id_mahasiswa ORDER BY w.tahun, w.semester) AS ipk_awal,
-        LAST_VALUE(f.ipk) OVER (PARTITION BY f.id_mahasiswa ORDER BY w.tahun, w.semester
+        FIRST_VALUE(f.ipk) OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq) AS ipk_awal,
+        LAST_VALUE(f.ipk) OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq
             ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS ipk_akhir
     FROM Fact_Nilai_Semester f
-    JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
 ) AS ipk_window;
 
 
@@ -286,10 +248,8 @@ SELECT
 FROM (
     SELECT f.id_mahasiswa,
            f.ipk,
-           w.tahun, w.semester,
-           RANK() OVER (PARTITION BY f.id_mahasiswa ORDER BY w.tahun DESC, w.semester DESC) AS urutan
+           RANK() OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq DESC) AS urutan
     FROM Fact_Nilai_Semester f
-    JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
 ) AS terakhir
 WHERE urutan = 1 AND ipk < 2.0;
 
@@ -303,23 +263,22 @@ JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu;
 
 -- Insight 27  : Korelasi antara IPS saat ini dan sebelumnya
 SELECT
-    f1.id_mahasiswa,
-    w1.tahun AS tahun_sekarang,
-    w1.semester AS semester_sekarang,
-    f1.ips AS ips_sekarang,
-    f2.ips AS ips_sebelumnya
-FROM Fact_Nilai_Semester f1
-JOIN Dim_Waktu w1 ON f1.id_waktu = w1.id_waktu
-JOIN Fact_Nilai_Semester f2 ON f2.id_mahasiswa = f1.id_mahasiswa
-JOIN Dim_Waktu w2 ON f2.id_waktu = w2.id_waktu
-WHERE (w1.tahun > w2.tahun) OR (w1.tahun = w2.tahun AND w1.semester = 'Genap' AND w2.semester = 'Gasal')
-  AND NOT EXISTS (
-      SELECT 1 FROM Fact_Nilai_Semester f3
-      JOIN Dim_Waktu w3 ON f3.id_waktu = w3.id_waktu
-      WHERE f3.id_mahasiswa = f1.id_mahasiswa
-        AND ((w3.tahun > w2.tahun) OR (w3.tahun = w2.tahun AND w3.semester = 'Genap'))
-        AND ((w3.tahun < w1.tahun) OR (w3.tahun = w1.tahun AND w3.semester = 'Gasal'))
-  );
+    id_mahasiswa,
+    tahun_sekarang,
+    semester_sekarang,
+    ips_sekarang,
+    ips_sebelumnya
+FROM (
+    SELECT
+        f.id_mahasiswa,
+        w.tahun AS tahun_sekarang,
+        w.semester AS semester_sekarang,
+        f.ips AS ips_sekarang,
+        LAG(f.ips) OVER (PARTITION BY f.id_mahasiswa ORDER BY f.semester_seq) AS ips_sebelumnya
+    FROM Fact_Nilai_Semester f
+    JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
+) AS pasangan
+WHERE ips_sebelumnya IS NOT NULL;
 
 -- Insight 28  : Ranking mahasiswa per semester berdasarkan IPS
 SELECT
@@ -328,11 +287,11 @@ SELECT
     m.nrp,
     m.nama,
     f.ips,
-    RANK() OVER (PARTITION BY w.tahun, w.semester ORDER BY f.ips DESC) AS peringkat_ips
+    RANK() OVER (PARTITION BY w.semester_seq ORDER BY f.ips DESC) AS peringkat_ips
 FROM Fact_Nilai_Semester f
 JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
 JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-ORDER BY w.tahun, w.semester, peringkat_ips;
+ORDER BY w.semester_seq, peringkat_ips;
 
 -- Insight 29  : Identifikasi semester dengan penurunan kolektif IPS terbesar
 SELECT
@@ -344,12 +303,12 @@ SELECT
 FROM (
     SELECT
         CONCAT(w.tahun, '-', w.semester) AS curr_semester,
-        LAG(CONCAT(w.tahun, '-', w.semester)) OVER (ORDER BY w.tahun, w.semester) AS prev_semester,
+        LAG(CONCAT(w.tahun, '-', w.semester)) OVER (ORDER BY w.semester_seq) AS prev_semester,
         AVG(f.ips) AS curr_avg,
-        LAG(AVG(f.ips)) OVER (ORDER BY w.tahun, w.semester) AS prev_avg
+        LAG(AVG(f.ips)) OVER (ORDER BY w.semester_seq) AS prev_avg
     FROM Fact_Nilai_Semester f
     JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
-    GROUP BY w.tahun, w.semester
+    GROUP BY w.semester_seq, w.tahun, w.semester
 ) AS delta
 WHERE prev_avg IS NOT NULL
 ORDER BY penurunan DESC
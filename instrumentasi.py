@@ -0,0 +1,202 @@
+# instrumentasi.py
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+# resource hanya ada di Unix; tanpa itu peak RSS tidak dilaporkan
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Ringkasan run (JSON) yang ditulis di akhir setiap run ETL
+RINGKASAN_PATH = "etl_run_summary.json"
+
+# Urutan tahap di log & ringkasan; tahap lain (mis. index, lakehouse) menyusul di belakang
+TAHAP = ["ekstrak", "transform", "hapus", "dimensi", "fakta", "checkpoint", "fakta_semester", "agregat", "commit"]
+
+
+# Peak RSS dalam KiB: proses loader dan worker ekstraksi (anak proses yang sudah selesai)
+def peak_rss():
+    if resource is None:
+        return None
+    return {
+        "proses": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "worker": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    }
+
+
+# === Cursor Terukur: setiap execute/executemany/COPY dihitung satu round-trip ke database ===
+class CursorTerukur:
+    def __init__(self, cursor, instrumentasi):
+        self.cursor = cursor
+        self.instrumentasi = instrumentasi
+
+    def execute(self, *args, **kwargs):
+        self.instrumentasi.round_trip()
+        return self.cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.instrumentasi.round_trip()
+        return self.cursor.executemany(*args, **kwargs)
+
+    def copy_expert(self, *args, **kwargs):
+        self.instrumentasi.round_trip()
+        return self.cursor.copy_expert(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+# === Instrumentasi Run: waktu, baris, dan round-trip per tahap (total dan per file) ===
+# Tahap batch (flush/commit di batas transaksi) hanya masuk total, tidak dibebankan ke file yang sedang dimuat.
+class Instrumentasi:
+    def __init__(self, hooks=(), per_file=True):
+        # hooks: callable(ringkasan) yang dipanggil saat ekspor (JSON, Prometheus, ...)
+        self.hooks = list(hooks)
+        self.per_file = per_file
+        self.run_id = None
+        self.mode = None
+        self.mulai = time.perf_counter()
+        self.tahap_total = {}
+        self.file_status = {}
+        self.files = {}
+        self.file = None
+        self.aktif = None
+
+    def mulai_run(self, run_id, mode):
+        self.run_id = run_id
+        self.mode = mode
+
+    def bungkus(self, cursor):
+        return CursorTerukur(cursor, self)
+
+    def _total(self, nama):
+        if nama not in self.tahap_total:
+            self.tahap_total[nama] = {"detik": 0.0, "jumlah": 0, "baris": 0, "round_trip": 0}
+        return self.tahap_total[nama]
+
+    def mulai_file(self, file, info=None):
+        self.file = file
+        if self.per_file:
+            self.files[file] = {"status": None, "tahap": {}, "round_trip": 0, "peak_mem": None, "rss_naik_kib": None}
+        if not info:
+            return
+        # Ekstraksi berjalan di worker; waktunya dilaporkan lewat info hasil ekstrak_file
+        if self.per_file:
+            self.files[file]["peak_mem"] = info.get("peak_mem")
+            self.files[file]["rss_naik_kib"] = info.get("rss_naik")
+        for nama, detik in info.get("tahap", {}).items():
+            self.catat(nama, detik, info.get("baris", {}).get(nama, 0))
+
+    def selesai_file(self, status):
+        self.file_status[status] = self.file_status.get(status, 0) + 1
+        if self.per_file and self.file in self.files:
+            self.files[self.file]["status"] = status
+        self.file = None
+
+    def catat(self, nama, detik, baris=0, batch=False):
+        total = self._total(nama)
+        total["detik"] += detik
+        total["jumlah"] += 1
+        total["baris"] += baris
+        if self.per_file and not batch and self.file in self.files:
+            tahap = self.files[self.file]["tahap"]
+            tahap[nama] = tahap.get(nama, 0.0) + detik
+
+    @contextmanager
+    def tahap(self, nama, baris=0, batch=False):
+        sebelumnya = self.aktif
+        self.aktif = (nama, batch)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.aktif = sebelumnya
+            self.catat(nama, time.perf_counter() - start, baris, batch)
+
+    def round_trip(self):
+        nama, batch = self.aktif or ("lain", True)
+        self._total(nama)["round_trip"] += 1
+        if self.per_file and not batch and self.file in self.files:
+            self.files[self.file]["round_trip"] += 1
+
+    def ringkasan(self):
+        durasi = time.perf_counter() - self.mulai
+        urutan = [nama for nama in TAHAP if nama in self.tahap_total]
+        urutan += [nama for nama in self.tahap_total if nama not in TAHAP]
+        tahap = {}
+        for nama in urutan:
+            total = self.tahap_total[nama]
+            tahap[nama] = dict(total, baris_per_detik=total["baris"] / total["detik"] if total["detik"] else None)
+        ringkasan = {
+            "run_id": self.run_id,
+            "mode": self.mode,
+            "durasi_detik": durasi,
+            "file": self.file_status,
+            "tahap": tahap,
+            "round_trip": sum(total["round_trip"] for total in self.tahap_total.values()),
+            "peak_rss_kib": peak_rss()
+        }
+        if self.per_file:
+            ringkasan["per_file"] = self.files
+        return ringkasan
+
+    def log(self):
+        for nama, total in self.ringkasan()["tahap"].items():
+            rps = f", {total['baris_per_detik']:.0f} baris/s" if total["baris"] and total["baris_per_detik"] else ""
+            logging.info(
+                f"⏱️ [INFO]: Tahap {nama}: {total['detik']:.2f}s dalam {total['jumlah']}x{rps}, "
+                f"{total['round_trip']} round-trip DB."
+            )
+
+    def ekspor(self):
+        ringkasan = self.ringkasan()
+        for hook in self.hooks:
+            hook(ringkasan)
+        return ringkasan
+
+
+# === Hook Ekspor ===
+def hook_json(path=RINGKASAN_PATH):
+    def tulis(ringkasan):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(ringkasan, f, indent=2)
+    return tulis
+
+
+def format_prometheus(ringkasan):
+    baris = [
+        "# HELP etl_stage_seconds_total Total waktu per tahap ETL.",
+        "# TYPE etl_stage_seconds_total counter"
+    ]
+    baris += [f'etl_stage_seconds_total{{stage="{nama}"}} {t["detik"]:.6f}' for nama, t in ringkasan["tahap"].items()]
+    baris += ["# HELP etl_stage_calls_total Jumlah eksekusi per tahap ETL.", "# TYPE etl_stage_calls_total counter"]
+    baris += [f'etl_stage_calls_total{{stage="{nama}"}} {t["jumlah"]}' for nama, t in ringkasan["tahap"].items()]
+    baris += ["# HELP etl_stage_rows_total Baris yang diproses per tahap ETL.", "# TYPE etl_stage_rows_total counter"]
+    baris += [f'etl_stage_rows_total{{stage="{nama}"}} {t["baris"]}' for nama, t in ringkasan["tahap"].items()]
+    baris += ["# HELP etl_db_roundtrips_total Round-trip database per tahap ETL.", "# TYPE etl_db_roundtrips_total counter"]
+    baris += [f'etl_db_roundtrips_total{{stage="{nama}"}} {t["round_trip"]}' for nama, t in ringkasan["tahap"].items()]
+    baris += ["# HELP etl_files_total File transkrip per status.", "# TYPE etl_files_total counter"]
+    baris += [f'etl_files_total{{status="{status}"}} {jumlah}' for status, jumlah in ringkasan["file"].items()]
+    baris += [
+        "# HELP etl_run_duration_seconds Durasi run ETL (wall clock).",
+        "# TYPE etl_run_duration_seconds gauge",
+        f"etl_run_duration_seconds {ringkasan['durasi_detik']:.6f}"
+    ]
+    if ringkasan["peak_rss_kib"]:
+        baris += ["# HELP etl_peak_rss_bytes Peak RSS proses loader dan worker.", "# TYPE etl_peak_rss_bytes gauge"]
+        baris += [f'etl_peak_rss_bytes{{process="{proses}"}} {kib * 1024}' for proses, kib in ringkasan["peak_rss_kib"].items()]
+    return "\n".join(baris) + "\n"
+
+
+# Format teks Prometheus, mis. untuk textfile collector node_exporter; ditulis atomik lewat file sementara
+def hook_prometheus(path):
+    def tulis(ringkasan):
+        sementara = path + ".tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            f.write(format_prometheus(ringkasan))
+        os.replace(sementara, path)
+    return tulis
@@ -0,0 +1,115 @@
+# ipk_numpy.py
+# numpy opsional: tanpa numpy Fact_Nilai_Semester dihitung dari baris fakta terurut (ORDER BY) dengan loop Python (fact_semester.py)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Baris fakta yang diambil per fetchmany; array dibangun bertahap agar tidak menahan jutaan tuple sekaligus
+FETCH_SIZE = 100000
+
+KOLOM_FAKTA = ["id_mahasiswa", "id_waktu", "semester_ordinal", "sks", "bobot", "id_nilai", "lulus", "id_mk", "percobaan"]
+
+
+# === Ambil Measure Fakta ke Array NumPy (satu query, tanpa ORDER BY) ===
+def ambil_fakta(cursor, id_mahasiswa_list=None):
+    sql = f"SELECT {', '.join(KOLOM_FAKTA)} FROM Fact_Nilai_MK"
+    params = ()
+    if id_mahasiswa_list is not None:
+        params = tuple(id_mahasiswa_list)
+        sql += f" WHERE id_mahasiswa IN ({', '.join(['%s'] * len(params))})"
+    cursor.execute(sql, params)
+
+    bagian = []
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        # DECIMAL (bobot) ikut dikonversi ke float64; id & sks tetap eksak di bawah 2^53
+        bagian.append(np.array(rows, dtype=np.float64))
+    data = np.concatenate(bagian) if bagian else np.empty((0, len(KOLOM_FAKTA)))
+    return {kolom: data[:, i] for i, kolom in enumerate(KOLOM_FAKTA)}
+
+
+# === Kontribusi IPK per baris fakta: hanya percobaan terbaik sejauh ini yang dihitung ===
+# Diurutkan per (mahasiswa, MK, percobaan): SKS masuk sekali di percobaan pertama, bobot masuk sebesar
+# kenaikan nilai terbaik berjalan. Jumlah kumulatif kontribusi = SKS & bobot dari percobaan terbaik saja.
+def _kontribusi_ipk(mahasiswa, fakta):
+    mk = fakta["id_mk"].astype(np.int64)
+    urut = np.lexsort((fakta["percobaan"], mk, mahasiswa))
+    bobot = fakta["bobot"][urut]
+
+    awal = np.ones(len(urut), dtype=bool)
+    awal[1:] = (mahasiswa[urut][1:] != mahasiswa[urut][:-1]) | (mk[urut][1:] != mk[urut][:-1])
+    grup = np.cumsum(awal) - 1
+    # SKS MK diambil dari percobaan pertama (sama untuk semua percobaan)
+    sks = fakta["sks"][urut][np.flatnonzero(awal)][grup]
+
+    # Maksimum berjalan per grup: offset grup*10 (> bobot maksimum 4.0) memisahkan grup dalam satu accumulate
+    offset = grup * 10.0
+    terbaik = np.maximum.accumulate(bobot + offset) - offset
+    sebelumnya = np.zeros(len(urut))
+    sebelumnya[1:] = terbaik[:-1]
+    sebelumnya[awal] = 0.0
+
+    delta_sks = np.zeros(len(urut))
+    delta_bobot = np.zeros(len(urut))
+    delta_sks[urut] = sks * awal
+    delta_bobot[urut] = sks * (terbaik - sebelumnya)
+    return delta_sks, delta_bobot
+
+
+# === IPS, IPK, nilai dominan, dan SKS lulus per (mahasiswa, semester) dengan operasi grup ===
+# IPS menghitung semua mata kuliah yang diambil di semester itu; IPK hanya percobaan terbaik tiap MK.
+# Hasil: list (id_mahasiswa, id_waktu, semester_seq, id_nilai, ips, ipk, sks, sks_lulus),
+# terurut per mahasiswa lalu semester, sama dengan fact_semester.hitung_ips_ipk.
+def hitung_semester(fakta):
+    if len(fakta["id_mahasiswa"]) == 0:
+        return []
+    mahasiswa = fakta["id_mahasiswa"].astype(np.int64)
+    seq = fakta["semester_ordinal"].astype(np.int64)
+    delta_sks, delta_bobot = _kontribusi_ipk(mahasiswa, fakta)
+
+    urut = np.lexsort((seq, mahasiswa))
+    mahasiswa, seq = mahasiswa[urut], seq[urut]
+    sks = fakta["sks"][urut]
+    bobot = fakta["bobot"][urut]
+    lulus = fakta["lulus"][urut]
+
+    # Awal tiap grup (mahasiswa, semester) pada array terurut, lalu nomor grup per baris
+    awal = np.ones(len(mahasiswa), dtype=bool)
+    awal[1:] = (mahasiswa[1:] != mahasiswa[:-1]) | (seq[1:] != seq[:-1])
+    posisi = np.flatnonzero(awal)
+    grup = np.cumsum(awal) - 1
+
+    total_sks = np.bincount(grup, weights=sks)
+    total_bobot = np.bincount(grup, weights=sks * bobot)
+    sks_lulus = np.bincount(grup, weights=sks * lulus)
+    ipk_sks = np.bincount(grup, weights=delta_sks[urut])
+    ipk_bobot = np.bincount(grup, weights=delta_bobot[urut])
+    # Nilai dominan = id_nilai terbesar di semester tersebut (sama dengan MAX(id_nilai) versi SQL)
+    id_nilai = np.maximum.reduceat(fakta["id_nilai"][urut].astype(np.int64), posisi)
+    mahasiswa_grup = mahasiswa[posisi]
+
+    # Kumulatif per mahasiswa: cumsum global dikurangi nilai cumsum tepat sebelum semester pertamanya
+    kum_sks = np.cumsum(ipk_sks)
+    kum_bobot = np.cumsum(ipk_bobot)
+    awal_mhs = np.ones(len(mahasiswa_grup), dtype=bool)
+    awal_mhs[1:] = mahasiswa_grup[1:] != mahasiswa_grup[:-1]
+    nomor_mhs = np.cumsum(awal_mhs) - 1
+    indeks_awal = np.flatnonzero(awal_mhs)
+    kum_sks -= (kum_sks - ipk_sks)[indeks_awal][nomor_mhs]
+    kum_bobot -= (kum_bobot - ipk_bobot)[indeks_awal][nomor_mhs]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ips = np.where(total_sks > 0, total_bobot / total_sks, 0.0)
+        ipk = np.where(kum_sks > 0, kum_bobot / kum_sks, 0.0)
+
+    # Pembulatan memakai round() Python (per grup, bukan per baris fakta): np.round membulatkan x*100
+    # sehingga kasus seperti 3.275 bisa berbeda dari hasil jalur SQL/Python
+    # tolist() mengembalikan int/float Python yang bisa di-bind semua driver DB
+    return list(zip(
+        mahasiswa_grup.tolist(), fakta["id_waktu"][urut][posisi].astype(np.int64).tolist(), seq[posisi].tolist(),
+        id_nilai.tolist(), [round(x, 2) for x in ips.tolist()], [round(x, 2) for x in ipk.tolist()],
+        total_sks.astype(np.int64).tolist(), sks_lulus.astype(np.int64).tolist()
+    ))
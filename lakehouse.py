@@ -0,0 +1,250 @@
+# lakehouse.py
+import os
+import json
+import time
+import uuid
+import shutil
+import argparse
+import logging
+from decimal import Decimal
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+LAKEHOUSE_PATH = "lakehouse"
+MANIFEST_FILE = "_manifest.json"
+
+# === Skema Parquet Star Schema ===
+# watermark: kolom id yang menandai baris baru (id auto-increment hanya bertambah);
+# tabel fakta memakai id_mahasiswa karena mahasiswa yang dimuat ulang selalu mendapat id baru.
+# kunci: kolom kunci asing yang di-dictionary-encode (nilainya berulang di setiap baris fakta).
+TABLES = {
+    "Dim_Mahasiswa": {
+        "sql": """
+            SELECT id_mahasiswa, nrp, nama, status, ipk, sks_persiapan, ip_persiapan,
+                   sks_sarjana, ip_sarjana, sks_tempuh, sks_lulus
+            FROM Dim_Mahasiswa WHERE id_mahasiswa > %s ORDER BY id_mahasiswa
+        """,
+        "schema": pa.schema([
+            ("id_mahasiswa", pa.int32()), ("nrp", pa.string()), ("nama", pa.string()),
+            ("status", pa.string()), ("ipk", pa.decimal128(3, 2)), ("sks_persiapan", pa.int32()),
+            ("ip_persiapan", pa.decimal128(3, 2)), ("sks_sarjana", pa.int32()),
+            ("ip_sarjana", pa.decimal128(3, 2)), ("sks_tempuh", pa.int32()), ("sks_lulus", pa.int32())
+        ]),
+        "watermark": "id_mahasiswa",
+        "kunci": [],
+        "partisi": None
+    },
+    "Dim_MataKuliah": {
+        "sql": "SELECT id_mk, kode_mk, nama_mk, sks, tahap FROM Dim_MataKuliah WHERE id_mk > %s ORDER BY id_mk",
+        "schema": pa.schema([
+            ("id_mk", pa.int32()), ("kode_mk", pa.string()), ("nama_mk", pa.string()),
+            ("sks", pa.int32()), ("tahap", pa.string())
+        ]),
+        "watermark": "id_mk",
+        "kunci": ["tahap"],
+        "partisi": None
+    },
+    "Dim_Waktu": {
+        "sql": "SELECT id_waktu, tahun, semester, semester_seq FROM Dim_Waktu WHERE id_waktu > %s ORDER BY id_waktu",
+        "schema": pa.schema([
+            ("id_waktu", pa.int32()), ("tahun", pa.int32()), ("semester", pa.string()), ("semester_seq", pa.int32())
+        ]),
+        "watermark": "id_waktu",
+        "kunci": [],
+        "partisi": None
+    },
+    "Dim_Nilai": {
+        "sql": "SELECT id_nilai, huruf, bobot FROM Dim_Nilai WHERE id_nilai > %s ORDER BY id_nilai",
+        "schema": pa.schema([("id_nilai", pa.int32()), ("huruf", pa.string()), ("bobot", pa.decimal128(3, 2))]),
+        "watermark": "id_nilai",
+        "kunci": [],
+        "partisi": None
+    },
+    "Fact_Nilai_MK": {
+        "sql": """
+            SELECT f.id_transkrip, f.id_mahasiswa, f.id_mk, f.id_waktu, f.id_nilai, f.bobot_matkul,
+                   f.sks, f.bobot, f.lulus, f.semester_ordinal, f.percobaan, f.percobaan_terakhir,
+                   f.percobaan_terbaik, w.tahun, w.semester
+            FROM Fact_Nilai_MK f JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
+            WHERE f.id_mahasiswa > %s ORDER BY f.id_mahasiswa, f.id_transkrip
+        """,
+        "schema": pa.schema([
+            ("id_transkrip", pa.int32()), ("id_mahasiswa", pa.int32()), ("id_mk", pa.int32()),
+            ("id_waktu", pa.int32()), ("id_nilai", pa.int32()), ("bobot_matkul", pa.decimal128(4, 2)),
+            ("sks", pa.int32()), ("bobot", pa.decimal128(3, 2)), ("lulus", pa.int8()),
+            ("semester_ordinal", pa.int32()), ("percobaan", pa.int16()), ("percobaan_terakhir", pa.int8()),
+            ("percobaan_terbaik", pa.int8()), ("tahun", pa.int32()), ("semester", pa.string())
+        ]),
+        "watermark": "id_mahasiswa",
+        "kunci": ["id_mahasiswa", "id_mk", "id_waktu", "id_nilai"],
+        "partisi": ["tahun", "semester"]
+    },
+    "Fact_Nilai_Semester": {
+        "sql": """
+            SELECT f.id_fakta, f.id_mahasiswa, f.id_waktu, f.semester_seq, f.id_nilai, f.ips, f.ipk, f.sks, f.sks_lulus,
+                   w.tahun, w.semester
+            FROM Fact_Nilai_Semester f JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
+            WHERE f.id_mahasiswa > %s ORDER BY f.id_mahasiswa, f.semester_seq
+        """,
+        "schema": pa.schema([
+            ("id_fakta", pa.int32()), ("id_mahasiswa", pa.int32()), ("id_waktu", pa.int32()),
+            ("semester_seq", pa.int32()), ("id_nilai", pa.int32()), ("ips", pa.decimal128(3, 2)), ("ipk", pa.decimal128(3, 2)),
+            ("sks", pa.int32()), ("sks_lulus", pa.int32()), ("tahun", pa.int32()), ("semester", pa.string())
+        ]),
+        "watermark": "id_mahasiswa",
+        "kunci": ["id_mahasiswa", "id_waktu", "id_nilai"],
+        "partisi": ["tahun", "semester"]
+    }
+}
+
+# Tabel yang barisnya ikut tersembunyi bila mahasiswanya dihapus/dimuat ulang di DW
+TABEL_PER_MAHASISWA = ["Dim_Mahasiswa", "Fact_Nilai_MK", "Fact_Nilai_Semester"]
+
+
+# === Manifest: daftar file aktif per tabel, watermark, dan id mahasiswa yang sudah tidak berlaku ===
+def baca_manifest(root):
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"versi": 1, "runs": [], "tables": {}, "dihapus_mahasiswa": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def tulis_manifest(root, manifest):
+    # Tulis ke file sementara lalu rename, supaya pembaca tidak pernah melihat manifest setengah jadi
+    path = os.path.join(root, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+# SQLite mengembalikan DECIMAL sebagai float; pyarrow hanya menerima Decimal untuk kolom decimal128
+def _kolom_decimal(col, tipe):
+    skala = Decimal(10) ** -tipe.scale
+    return [Decimal(str(v)).quantize(skala) if isinstance(v, float) else v for v in col]
+
+
+def _ke_tabel(rows, schema):
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.Table.from_arrays([
+        pa.array(_kolom_decimal(col, f.type) if pa.types.is_decimal(f.type) else col, type=f.type)
+        for col, f in zip(columns, schema)
+    ], schema=schema)
+
+
+# === Tulis satu potongan baris sebagai file Parquet baru (tidak pernah menimpa file lama) ===
+def tulis_tabel(root, table, rows, run_id):
+    spec = TABLES[table]
+    data = _ke_tabel(rows, spec["schema"])
+    table_dir = os.path.join(root, table)
+    files = []
+
+    if spec["partisi"]:
+        pq.write_to_dataset(
+            data, table_dir,
+            partition_cols=spec["partisi"],
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda written: files.append(written.path),
+            use_dictionary=spec["kunci"] or False,
+            compression="zstd"
+        )
+    else:
+        os.makedirs(table_dir, exist_ok=True)
+        path = os.path.join(table_dir, f"part-{run_id}.parquet")
+        pq.write_table(data, path, use_dictionary=spec["kunci"] or False, compression="zstd")
+        files.append(path)
+
+    return [os.path.relpath(path, root) for path in files]
+
+
+def _id_mahasiswa_terekspor(root, manifest):
+    files = manifest["tables"].get("Dim_Mahasiswa", {}).get("files", [])
+    if not files:
+        return set()
+    ids = ds.dataset([os.path.join(root, f) for f in files], format="parquet").to_table(columns=["id_mahasiswa"])
+    return set(ids.column("id_mahasiswa").to_pylist())
+
+
+# === Ekspor DW -> Lakehouse: penuh (bangun ulang) atau incremental (append-only) ===
+def ekspor_lakehouse(cursor, root=LAKEHOUSE_PATH, incremental=False):
+    if not incremental and os.path.exists(root):
+        shutil.rmtree(root)
+    os.makedirs(root, exist_ok=True)
+
+    manifest = baca_manifest(root)
+    # Suffix acak: dua ekspor dalam detik yang sama tidak saling menimpa file part-{run_id}
+    run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    # Watermark mahasiswa diambil sebelum ekspor apa pun, supaya fakta dan dimensinya memakai batas yang sama
+    watermark_mhs = manifest["tables"].get("Dim_Mahasiswa", {}).get("watermark", 0)
+
+    # Mahasiswa yang sudah diekspor tetapi tidak ada lagi di DW (dihapus atau dimuat ulang dengan id baru)
+    if incremental:
+        terekspor = _id_mahasiswa_terekspor(root, manifest)
+        cursor.execute("SELECT id_mahasiswa FROM Dim_Mahasiswa WHERE id_mahasiswa <= %s", (watermark_mhs,))
+        masih_ada = {row[0] for row in cursor.fetchall()}
+        dihapus = sorted(terekspor - masih_ada - set(manifest["dihapus_mahasiswa"]))
+        manifest["dihapus_mahasiswa"].extend(dihapus)
+        if dihapus:
+            logging.info(f"🪦 [INFO]: {len(dihapus)} mahasiswa ditandai tidak berlaku di lakehouse.")
+
+    baris = {}
+    for table, spec in TABLES.items():
+        state = manifest["tables"].setdefault(table, {"watermark": 0, "files": []})
+        watermark = watermark_mhs if spec["watermark"] == "id_mahasiswa" else state["watermark"]
+        cursor.execute(spec["sql"], (watermark,))
+        rows = cursor.fetchall()
+        baris[table] = len(rows)
+        if not rows:
+            continue
+
+        state["files"].extend(tulis_tabel(root, table, rows, run_id))
+        posisi = spec["schema"].get_field_index(spec["watermark"])
+        state["watermark"] = max(state["watermark"], max(row[posisi] for row in rows))
+        logging.info(f"🧊 [INFO]: {len(rows)} baris {table} ditulis ke lakehouse.")
+
+    manifest["runs"].append({
+        "run_id": run_id,
+        "waktu": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "mode": "incremental" if incremental else "penuh",
+        "baris": baris
+    })
+    tulis_manifest(root, manifest)
+    return baris
+
+
+# === Baca satu tabel lakehouse sesuai manifest (baris mahasiswa yang tidak berlaku dibuang) ===
+def baca_tabel(root, table):
+    manifest = baca_manifest(root)
+    files = manifest["tables"].get(table, {}).get("files", [])
+    spec = TABLES[table]
+    if not files:
+        return spec["schema"].empty_table()
+
+    partitioning = ds.partitioning(flavor="hive") if spec["partisi"] else None
+    dataset = ds.dataset(
+        [os.path.join(root, f) for f in files], format="parquet",
+        partition_base_dir=os.path.join(root, table), partitioning=partitioning
+    )
+    dihapus = manifest["dihapus_mahasiswa"]
+    if table in TABEL_PER_MAHASISWA and dihapus:
+        return dataset.to_table(filter=~ds.field("id_mahasiswa").isin(dihapus))
+    return dataset.to_table()
+
+
+if __name__ == "__main__":
+    import mysql.connector
+    from ETL_FINAL import DB_NAME, DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Ekspor star schema DW ke lakehouse Parquet")
+    parser.add_argument("--path", default=LAKEHOUSE_PATH)
+    parser.add_argument("--incremental", action="store_true", help="tambahkan hanya baris baru (append-only)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    conn = mysql.connector.connect(database=DB_NAME, **DB_CONFIG)
+    cursor = conn.cursor()
+    ekspor_lakehouse(cursor, args.path, incremental=args.incremental)
+    cursor.close()
+    conn.close()
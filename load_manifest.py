@@ -0,0 +1,50 @@
+# load_manifest.py
+import logging
+
+MANIFEST_SQL = """
+    CREATE TABLE IF NOT EXISTS Load_Manifest (
+        nama_file VARCHAR(255) PRIMARY KEY,
+        file_hash CHAR(64) NOT NULL,
+        nrp VARCHAR(20) NOT NULL,
+        waktu_load TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def baca_manifest(cursor):
+    cursor.execute("SELECT nama_file, file_hash, nrp FROM Load_Manifest")
+    return {nama_file: (file_hash, nrp) for nama_file, file_hash, nrp in cursor.fetchall()}
+
+
+# === Bandingkan isi folder dengan manifest: file baru, berubah, dihapus ===
+def hitung_delta(manifest, file_hashes):
+    delta = {"baru": [], "berubah": [], "dihapus": [], "tetap": []}
+    for nama_file, file_hash in file_hashes.items():
+        if nama_file not in manifest:
+            delta["baru"].append(nama_file)
+        elif manifest[nama_file][0] != file_hash:
+            delta["berubah"].append(nama_file)
+        else:
+            delta["tetap"].append(nama_file)
+    delta["dihapus"] = [nama_file for nama_file in manifest if nama_file not in file_hashes]
+    logging.info(
+        f"🧾 [INFO]: Delta manifest: {len(delta['baru'])} baru, {len(delta['berubah'])} berubah, "
+        f"{len(delta['dihapus'])} dihapus, {len(delta['tetap'])} tetap."
+    )
+    return delta
+
+
+def hapus_manifest(cursor, nama_file):
+    cursor.execute("DELETE FROM Load_Manifest WHERE nama_file = %s", (nama_file,))
+
+
+# === Hapus fakta + baris Dim_Mahasiswa milik satu NRP (urut sesuai foreign key) ===
+def hapus_mahasiswa(cursor, nrp, fact_tables):
+    cursor.execute("SELECT id_mahasiswa FROM Dim_Mahasiswa WHERE nrp = %s", (nrp,))
+    result = cursor.fetchone()
+    if not result:
+        return None
+    for table in fact_tables:
+        cursor.execute(f"DELETE FROM {table} WHERE id_mahasiswa = %s", (result[0],))
+    cursor.execute("DELETE FROM Dim_Mahasiswa WHERE id_mahasiswa = %s", (result[0],))
+    return result[0]
@@ -0,0 +1,412 @@
+# pipeline.py
+import os
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from backend import BACKENDS
+from bulk_loader import FLUSH_SIZE
+from fact_semester import refresh_fact_semester
+from agregat import AGREGAT_SQL, kunci_baru, catat_kunci, kunci_mahasiswa, refresh_agregat
+from extract_pdf import ekstrak_paralel, StatistikEkstraksi, EXTRACT_WORKERS, EXTRACT_MODE
+from extract_cache import ExtractCache, hash_file
+from transkrip_parser import semester_ordinal
+from schema import tabel_sql, buat_index, periksa_plan
+from insight_sql import baca_insight
+from transaksi import TransaksiManager, COMMIT_EVERY
+from checkpoint import CHECKPOINT_SQL, mulai_run, run_terakhir, file_selesai, catat_file, selesai_run
+from load_manifest import MANIFEST_SQL, baca_manifest, hitung_delta, hapus_manifest, hapus_mahasiswa
+from instrumentasi import Instrumentasi, hook_json, hook_prometheus, RINGKASAN_PATH
+
+# Cache hasil ekstraksi per hash isi PDF; file yang tidak berubah tidak di-parse ulang
+EXTRACT_CACHE_PATH = "extract_cache.sqlite"
+
+FOLDER_TRANSKRIP = "data_transkrip"
+
+NILAI_BOBOT = {
+    "A": 4.0,
+    "AB": 3.5,
+    "B": 3.0,
+    "BC": 2.5,
+    "C": 2.0,
+    "D": 1.0,
+    "E": 0.0
+}
+# Nilai dengan bobot minimal ini dihitung lulus (D dan E tidak lulus)
+BOBOT_LULUS = 2.0
+
+# === Model Star Schema ===
+# fakta: tabel fakta per mata kuliah; turunan: Fact_Nilai_Semester + tabel agregat ikut dirawat;
+# hapus: tabel fakta milik satu mahasiswa, urut aman untuk DELETE
+MODEL = {
+    "2fact": {"fakta": "Fact_Nilai_MK", "turunan": True, "hapus": ["Fact_Nilai_Semester", "Fact_Nilai_MK"]},
+    "transkrip": {"fakta": "Fact_Transkrip", "turunan": False, "hapus": ["Fact_Transkrip"]}
+}
+
+FACT_COLUMNS = [
+    "id_mahasiswa", "id_mk", "id_waktu", "id_nilai", "bobot_matkul",
+    "sks", "bobot", "lulus", "semester_ordinal", "percobaan", "percobaan_terakhir", "percobaan_terbaik"
+]
+
+
+# === Percobaan per (mahasiswa, MK) dalam satu transkrip ===
+# fact_rows: (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul, sks, bobot, lulus, semester_ordinal).
+# Percobaan diurutkan kronologis (urutan di transkrip untuk semester yang sama); terbaik = bobot tertinggi,
+# bila sama yang terakhir. Baris kembar persis dibuang, bukan lagi menggagalkan file (unique_transkrip).
+def tandai_percobaan(fact_rows):
+    unik = list(dict.fromkeys(fact_rows))
+    per_mk = {}
+    for i, row in enumerate(unik):
+        per_mk.setdefault(row[1], []).append(i)
+
+    hasil = [None] * len(unik)
+    for indeks in per_mk.values():
+        indeks.sort(key=lambda i: (unik[i][8], i))
+        terbaik = max(range(len(indeks)), key=lambda k: (unik[indeks[k]][6], k))
+        for k, i in enumerate(indeks):
+            hasil[i] = (*unik[i], k + 1, int(k == len(indeks) - 1), int(k == terbaik))
+    return hasil, len(fact_rows) - len(unik)
+
+
+# Backend server memakai konfigurasi koneksi skrip aslinya
+def buat_backend(nama, db_name):
+    if nama == "mysql":
+        from ETL_FINAL import DB_CONFIG
+    elif nama == "postgres":
+        from etl_transkrip_postgres import DB_CONFIG
+    else:
+        DB_CONFIG = {}
+    return BACKENDS[nama](db_name, DB_CONFIG)
+
+
+def _buat_index_tabel(pool, table, dialect):
+    with pool.cursor() as cursor:
+        return buat_index(cursor, [table], dialect=dialect)
+
+
+# === Load ETL: state koneksi, cache dimensi, loader, dan transaksi untuk memuat transkrip satu per satu ===
+# Dipakai jalankan_etl (sekali jalan) maupun ingest_daemon (terus-menerus).
+class LoadETL:
+    def __init__(self, backend, model="2fact", incremental=False, resume=False, kode_prefix=None,
+                 flush_size=FLUSH_SIZE, commit_every=COMMIT_EVERY, instrumentasi=None):
+        self.backend = backend
+        self.spec = MODEL[model]
+        self.turunan = self.spec["turunan"]
+        self.incremental = incremental
+        self.resume = resume
+        self.kode_prefix = kode_prefix
+        self.flush_size = flush_size
+        self.commit_every = commit_every
+        self.selesai = set()
+        self.run_gagal = False
+        self.ukur = instrumentasi or Instrumentasi()
+
+    # False bila diminta resume tetapi tidak ada run yang terhenti
+    def buka(self):
+        backend = self.backend
+
+        # === Buat dan Refresh Database (resume tidak pernah men-drop database) ===
+        backend.connect(reset=not (self.incremental or self.resume))
+        # Semua query pipeline lewat cursor ini sehingga round-trip DB terhitung per tahap
+        backend.cursor = self.ukur.bungkus(backend.cursor)
+        self.cursor = cursor = backend.cursor
+        if self.incremental or self.resume:
+            logging.info("Mode incremental/resume: database dw dipakai ulang.")
+        else:
+            logging.info("Database dw berhasil dibuat ulang.")
+
+        # === Buat Tabel-Tabel Star Schema ===
+        backend.buat_tabel(
+            tabel_sql(self.spec["fakta"], self.turunan) + (AGREGAT_SQL if self.turunan else [])
+            + [MANIFEST_SQL] + CHECKPOINT_SQL
+        )
+        logging.info("Tabel-tabel star schema berhasil dibuat.")
+
+        # === Checkpoint: run baru, atau lanjutkan run terakhir yang terhenti dengan mode aslinya ===
+        if self.resume:
+            run = run_terakhir(cursor)
+            if run is None:
+                logging.warning("⚠️ [WARNING]: Tidak ada run terhenti yang bisa dilanjutkan.")
+                backend.close()
+                return False
+            self.run_id, mode = run
+            self.incremental = mode == "incremental"
+            self.selesai = file_selesai(cursor, self.run_id)
+            logging.info(f"⏯️ [INFO]: Melanjutkan run {self.run_id} ({mode}); {len(self.selesai)} file yang sudah di-commit dilewati.")
+        else:
+            self.run_id = mulai_run(cursor, "incremental" if self.incremental else "penuh")
+        backend.commit()
+        self.ukur.mulai_run(self.run_id, "incremental" if self.incremental else "penuh")
+
+        # === Cache Kunci Dimensi ===
+        self.dim_mk = backend.dim_cache("Dim_MataKuliah", "id_mk", ["kode_mk"], ["nama_mk", "sks", "tahap"])
+        self.dim_waktu = backend.dim_cache("Dim_Waktu", "id_waktu", ["tahun", "semester"], ["semester_seq"])
+        self.dim_nilai = backend.dim_cache("Dim_Nilai", "id_nilai", ["huruf"], ["bobot"])
+        dim_caches = [self.dim_mk, self.dim_waktu, self.dim_nilai]
+        for cache in dim_caches:
+            cache.preload()
+
+        # === Insert Nilai Referensi ===
+        self.dim_nilai.resolve({huruf: (bobot,) for huruf, bobot in NILAI_BOBOT.items()})
+        backend.commit()
+        logging.info("Referensi nilai berhasil dimasukkan ke Dim_Nilai.")
+
+        # === Bulk Loader Fakta (flush per file di dalam savepoint-nya, bukan otomatis per flush_size) ===
+        self.fact_loader = backend.bulk_loader(self.spec["fakta"], FACT_COLUMNS, flush_size=self.flush_size, auto_flush=False)
+        self.transaksi = TransaksiManager(backend, self.commit_every, loaders=[self.fact_loader], caches=dim_caches,
+                                          instrumentasi=self.ukur)
+        self.manifest = baca_manifest(cursor)
+        return True
+
+    # === File yang hilang dari folder: fakta mahasiswanya dibuang (satu transaksi) ===
+    def hapus_file(self, files):
+        cursor = self.cursor
+        kunci = kunci_baru()
+        for nama_file in files:
+            if nama_file not in self.manifest:
+                continue
+            nrp = self.manifest.pop(nama_file)[1]
+            if self.turunan:
+                kunci_mahasiswa(cursor, nrp, kunci)
+            with self.ukur.tahap("hapus", batch=True):
+                hapus_mahasiswa(cursor, nrp, self.spec["hapus"])
+                hapus_manifest(cursor, nama_file)
+            logging.info(f"🗑️ [INFO]: {nama_file} dihapus dari folder, fakta mahasiswa dibuang.")
+        if self.turunan and files:
+            with self.ukur.tahap("agregat", batch=True):
+                refresh_agregat(cursor, kunci)
+        with self.ukur.tahap("commit", batch=True):
+            self.backend.commit()
+
+    # info: hasil ekstrak_file (waktu tahap & puncak memori), None bila record dari cache ekstraksi
+    def muat(self, file, file_hash, record, error=None, info=None):
+        logging.info(f"🔄 Memulai proses ETL untuk: {file}")
+        if info and info["peak_mem"] is not None:
+            logging.info(f"📈 [INFO]: Puncak memori ekstraksi {file}: {info['peak_mem'] / 1024:.1f} KiB ({EXTRACT_MODE}).")
+        if info and info.get("rss_naik"):
+            logging.info(f"📈 [INFO]: Peak RSS worker naik {info['rss_naik']} KiB saat ekstraksi {file} ({EXTRACT_MODE}).")
+        self.ukur.mulai_file(file, info)
+        berhasil = self._muat(file, file_hash, record, error)
+        self.ukur.selesai_file("selesai" if berhasil else "gagal")
+        return berhasil
+
+    def _muat(self, file, file_hash, record, error):
+        backend, cursor, spec = self.backend, self.cursor, self.spec
+        if error:
+            logging.error(f"💥 [ERROR]: {file} error fatal: {error}\n")
+            with self.ukur.tahap("checkpoint"):
+                catat_file(backend, self.run_id, file, "gagal", error)
+            return False
+
+        if record is None:
+            logging.error(f"❌ [GAGAL]: {file} gagal di-transform: NRP/Nama tidak ditemukan.")
+            with self.ukur.tahap("checkpoint"):
+                catat_file(backend, self.run_id, file, "gagal", "NRP/Nama tidak ditemukan")
+            return False
+
+        if self.kode_prefix:
+            # Cache ekstraksi menyimpan transkrip lengkap; filter kode dilakukan saat load
+            record.mata_kuliah = [mk for mk in record.mata_kuliah if mk.kode_mk.startswith(self.kode_prefix)]
+
+        logging.info(f"✅ [SUKSES]: {file} berhasil di-transform.")
+
+        # === Load Data ke Tabel DW (satu SAVEPOINT per file) ===
+        self.transaksi.mulai_file(file)
+        try:
+            if self.incremental:
+                # File berubah/baru menggantikan seluruh fakta mahasiswa tersebut (lama & baru)
+                with self.ukur.tahap("hapus"):
+                    kunci = kunci_baru()
+                    if file in self.manifest and self.manifest[file][1] != record.nrp:
+                        if self.turunan:
+                            kunci_mahasiswa(cursor, self.manifest[file][1], kunci)
+                        hapus_mahasiswa(cursor, self.manifest[file][1], spec["hapus"])
+                    if self.turunan:
+                        kunci_mahasiswa(cursor, record.nrp, kunci)
+                    hapus_mahasiswa(cursor, record.nrp, spec["hapus"])
+
+            with self.ukur.tahap("dimensi", len(record.mata_kuliah) + 1):
+                id_mhs = backend.get_or_create_id("Dim_Mahasiswa", "id_mahasiswa", ["nrp"], {
+                    "nrp": record.nrp, "nama": record.nama, "status": record.status, "ipk": record.ipk,
+                    "sks_persiapan": record.sks_persiapan, "ip_persiapan": record.ip_persiapan,
+                    "sks_sarjana": record.sks_sarjana, "ip_sarjana": record.ip_sarjana,
+                    "sks_tempuh": record.sks_tempuh, "sks_lulus": record.sks_lulus
+                })
+
+                mk_rows = []
+                mk_members, waktu_members, nilai_members = {}, {}, {}
+
+                for kode_mk, nama_mk, sks, tahun, semester, nilai, tahap in record.mata_kuliah:
+                    bobot = NILAI_BOBOT.get(nilai, 0.0)
+                    bobot_matkul = sks * bobot
+
+                    mk_members.setdefault(kode_mk, (nama_mk, sks, tahap))
+                    waktu_members.setdefault((tahun, semester), (semester_ordinal(tahun, semester),))
+                    nilai_members.setdefault(nilai, (bobot,))
+                    # Measure denormalisasi: insight tidak perlu join Dim_MataKuliah/Dim_Nilai/Dim_Waktu
+                    measures = (sks, bobot, int(bobot >= BOBOT_LULUS), semester_ordinal(tahun, semester))
+                    mk_rows.append((kode_mk, (tahun, semester), nilai, bobot_matkul, measures))
+
+                # === Resolusi Kunci Dimensi dari Cache ===
+                id_mk_map = self.dim_mk.resolve(mk_members)
+                id_waktu_map = self.dim_waktu.resolve(waktu_members)
+                id_nilai_map = self.dim_nilai.resolve(nilai_members)
+
+            fact_rows, duplikat = tandai_percobaan([
+                (id_mhs, id_mk_map[kode_mk], id_waktu_map[waktu], id_nilai_map[nilai], bobot_matkul, *measures)
+                for kode_mk, waktu, nilai, bobot_matkul, measures in mk_rows
+            ])
+            if duplikat:
+                logging.warning(f"⚠️ [WARNING]: {file}: {duplikat} baris mata kuliah kembar dilewati.")
+            self.fact_loader.extend(fact_rows)
+            with self.ukur.tahap("checkpoint"):
+                backend.upsert("Load_Manifest", {"nama_file": file, "file_hash": file_hash, "nrp": record.nrp}, ["nama_file"])
+
+            # Fakta di-flush di dalam savepoint file: pelanggaran unique hanya menggagalkan file ini
+            with self.ukur.tahap("fakta", len(fact_rows)):
+                self.fact_loader.flush()
+
+            if self.incremental:
+                # Penggantian mahasiswa utuh di savepoint ini: fakta MK, fakta turunan, agregat, dan manifest
+                if self.turunan:
+                    with self.ukur.tahap("fakta_semester", 1):
+                        refresh_fact_semester(cursor, [id_mhs], dialect=backend.dialect)
+                    with self.ukur.tahap("agregat"):
+                        catat_kunci(kunci, fact_rows)
+                        refresh_agregat(cursor, kunci)
+
+            with self.ukur.tahap("checkpoint"):
+                catat_file(backend, self.run_id, file, "selesai")
+            self.transaksi.selesai_file()
+            self.manifest[file] = (file_hash, record.nrp)
+            logging.info(f"🎉[SUKSES]: Proses ETL untuk {file} SELESAI.\n")
+
+        except Exception as e:
+            # Hanya file ini yang dibatalkan; file lain di batch tetap
+            self.transaksi.batal_file()
+            logging.error(f"💥 [ERROR]: {file} error fatal: {e}\n")
+            with self.ukur.tahap("checkpoint"):
+                catat_file(backend, self.run_id, file, "gagal", str(e))
+            return False
+
+        return not self.transaksi.batch_penuh() or self.commit()
+
+    # === Commit batch; bila COMMIT gagal, file batch dicatat gagal dan run ditandai gagal ===
+    def commit(self):
+        if self.transaksi.commit():
+            return True
+        self.run_gagal = True
+        # Manifest di memori disinkronkan ulang dengan database yang sudah di-rollback
+        self.manifest = baca_manifest(self.cursor)
+        try:
+            for file in self.transaksi.dibatalkan:
+                catat_file(self.backend, self.run_id, file, "gagal", "commit batch gagal")
+            self.backend.commit()
+        except Exception as e:
+            self.backend.rollback()
+            logging.error(f"💥 [ERROR]: Status gagal batch tidak bisa dicatat: {e}")
+        return False
+
+    def akhiri(self):
+        self.commit()
+
+        # === Fakta turunan & agregat: mode penuh dibangun sekali di akhir (fakta diambil sekali), incremental sudah per file ===
+        if self.turunan and not self.incremental:
+            with self.ukur.tahap("fakta_semester", batch=True):
+                refresh_fact_semester(self.cursor, dialect=self.backend.dialect)
+            with self.ukur.tahap("agregat", batch=True):
+                refresh_agregat(self.cursor)
+
+        selesai_run(self.cursor, self.run_id, "gagal" if self.run_gagal else "selesai")
+        self.backend.commit()
+
+    # === Index dibuat setelah load (paralel per tabel lewat pool), lalu plan insight diperiksa ===
+    def buat_index(self, periksa_insight=False):
+        backend = self.backend
+        tabel_index = ["Dim_Waktu", self.spec["fakta"]] + (["Fact_Nilai_Semester"] if self.turunan else [])
+        pool = backend.pool()
+        with self.ukur.tahap("index", batch=True), ThreadPoolExecutor(max_workers=pool.size) as executor:
+            list(executor.map(lambda table: _buat_index_tabel(pool, table, backend.dialect), tabel_index))
+        pool.close()
+        if periksa_insight and self.turunan and backend.dialect != "sqlite":
+            periksa_plan(self.cursor, baca_insight(), dialect=backend.dialect)
+
+    def tutup(self):
+        self.backend.close()
+
+
+# === ETL: PDF -> star schema di backend mana pun ===
+def jalankan_etl(backend, model="2fact", incremental=False, folder_path=FOLDER_TRANSKRIP, kode_prefix=None,
+                 lakehouse_path=None, periksa_insight=False, flush_size=FLUSH_SIZE, commit_every=COMMIT_EVERY,
+                 resume=False, ringkasan_path=RINGKASAN_PATH, prometheus_path=None):
+    # === Instrumentasi: ringkasan JSON di akhir run, opsional teks Prometheus ===
+    hooks = [hook_json(ringkasan_path)] if ringkasan_path else []
+    if prometheus_path:
+        hooks.append(hook_prometheus(prometheus_path))
+    ukur = Instrumentasi(hooks)
+    etl = LoadETL(backend, model, incremental=incremental, resume=resume, kode_prefix=kode_prefix,
+                  flush_size=flush_size, commit_every=commit_every, instrumentasi=ukur)
+    if not etl.buka():
+        return
+
+    # === Proses Semua PDF ===
+    pdf_files = [f for f in os.listdir(folder_path) if f.endswith(".pdf")]
+    logging.info(f"📦 [INFO]: Ditemukan {len(pdf_files)} file PDF di folder '{folder_path}'\n")
+
+    # === Deteksi Delta terhadap Load_Manifest ===
+    file_hashes = {f: hash_file(os.path.join(folder_path, f)) for f in pdf_files}
+    if etl.incremental:
+        delta = hitung_delta(etl.manifest, file_hashes)
+        etl.hapus_file(delta["dihapus"])
+        pdf_files = delta["baru"] + delta["berubah"]
+    pdf_files = [f for f in pdf_files if f not in etl.selesai]
+
+    # === Extract + Transform paralel, Load berurutan di koneksi ini ===
+    extract_cache = ExtractCache(EXTRACT_CACHE_PATH)
+    statistik_ekstraksi = StatistikEkstraksi()
+    hasil_ekstraksi = ekstrak_paralel(folder_path, pdf_files, workers=EXTRACT_WORKERS, cache=extract_cache, file_hashes=file_hashes,
+                                      mode=EXTRACT_MODE, statistik=statistik_ekstraksi)
+    for file, record, error, info in hasil_ekstraksi:
+        etl.muat(file, file_hashes[file], record, error, info)
+
+    statistik_ekstraksi.log()
+    extract_cache.close()
+    etl.akhiri()
+    etl.buat_index(periksa_insight)
+
+    # === Ekspor ke Lakehouse Parquet (append-only saat incremental) ===
+    if lakehouse_path:
+        # pyarrow hanya dibutuhkan bila lakehouse dipakai
+        from lakehouse import ekspor_lakehouse
+        with ukur.tahap("lakehouse", batch=True):
+            ekspor_lakehouse(etl.cursor, lakehouse_path, incremental=etl.incremental)
+
+    ukur.log()
+    ukur.ekspor()
+    if ringkasan_path:
+        logging.info(f"📝 [INFO]: Ringkasan run ditulis ke {ringkasan_path}.")
+    etl.tutup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL transkrip ke backend pilihan")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="sqlite")
+    parser.add_argument("--db", default="dw_transkrip.sqlite", help="nama database, atau path file untuk sqlite")
+    parser.add_argument("--model", choices=sorted(MODEL), default="2fact")
+    parser.add_argument("--folder", default=FOLDER_TRANSKRIP, help="folder PDF (mis. hasil transkrip_sintetis.py --pdf)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--incremental", action="store_true",
+                      help="pakai ulang database dan muat hanya PDF baru/berubah/dihapus")
+    mode.add_argument("--resume", action="store_true",
+                      help="lanjutkan run terakhir yang terhenti, lewati file yang sudah di-commit")
+    parser.add_argument("--summary", default=RINGKASAN_PATH, help="file ringkasan run (JSON)")
+    parser.add_argument("--prometheus", help="tulis metrik tahap ETL dalam format teks Prometheus ke file ini")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        handlers=[logging.FileHandler("etl_pipeline.log", mode='w', encoding='utf-8')],
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    jalankan_etl(buat_backend(args.backend, args.db), args.model, incremental=args.incremental, resume=args.resume,
+                 folder_path=args.folder, ringkasan_path=args.summary, prometheus_path=args.prometheus)
+    print("✅ Seluruh proses ETL selesai. Lihat log di etl_pipeline.log")
@@ -0,0 +1,262 @@
+# schema.py
+import re
+import sys
+import json
+import argparse
+import logging
+from insight_sql import baca_insight
+
+# === Tabel-Tabel Star Schema (DDL portabel; {serial} diisi backend) ===
+# Hanya primary key auto-increment yang berbeda antar dialek, sisanya SQL standar
+# yang diterima MySQL/MariaDB, PostgreSQL, dan SQLite.
+DIMENSI_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS Dim_Mahasiswa (
+        id_mahasiswa {serial},
+        nrp VARCHAR(20) UNIQUE NOT NULL,
+        nama VARCHAR(100) NOT NULL,
+        status VARCHAR(50),
+        ipk DECIMAL(3,2),
+        sks_persiapan INT,
+        ip_persiapan DECIMAL(3,2),
+        sks_sarjana INT,
+        ip_sarjana DECIMAL(3,2),
+        sks_tempuh INT,
+        sks_lulus INT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dim_MataKuliah (
+        id_mk {serial},
+        kode_mk VARCHAR(20) UNIQUE NOT NULL,
+        nama_mk VARCHAR(100) NOT NULL,
+        sks INT NOT NULL,
+        tahap VARCHAR(20) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dim_Waktu (
+        id_waktu {serial},
+        tahun INT NOT NULL,
+        semester VARCHAR(20) NOT NULL,
+        semester_seq INT NOT NULL,
+        CONSTRAINT unique_time UNIQUE (tahun, semester)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dim_Nilai (
+        id_nilai {serial},
+        huruf VARCHAR(5) UNIQUE NOT NULL,
+        bobot DECIMAL(3,2) NOT NULL
+    )
+    """
+]
+
+# Fakta per mata kuliah; nama tabel berbeda per model (Fact_Nilai_MK / Fact_Transkrip)
+FACT_MK_SQL = """
+    CREATE TABLE IF NOT EXISTS {fact} (
+        id_transkrip {serial},
+        id_mahasiswa INT NOT NULL,
+        id_mk INT NOT NULL,
+        id_waktu INT NOT NULL,
+        id_nilai INT NOT NULL,
+        bobot_matkul DECIMAL(4,2) NOT NULL,
+        sks INT NOT NULL,
+        bobot DECIMAL(3,2) NOT NULL,
+        lulus SMALLINT NOT NULL,
+        semester_ordinal INT NOT NULL,
+        percobaan SMALLINT NOT NULL DEFAULT 1,
+        percobaan_terakhir SMALLINT NOT NULL DEFAULT 1,
+        percobaan_terbaik SMALLINT NOT NULL DEFAULT 1,
+        FOREIGN KEY (id_mahasiswa) REFERENCES Dim_Mahasiswa(id_mahasiswa),
+        FOREIGN KEY (id_mk) REFERENCES Dim_MataKuliah(id_mk),
+        FOREIGN KEY (id_waktu) REFERENCES Dim_Waktu(id_waktu),
+        FOREIGN KEY (id_nilai) REFERENCES Dim_Nilai(id_nilai),
+        CONSTRAINT unique_transkrip UNIQUE (id_mahasiswa, id_mk, percobaan)
+    )
+"""
+
+FACT_SEMESTER_SQL = """
+    CREATE TABLE IF NOT EXISTS Fact_Nilai_Semester (
+        id_fakta {serial},
+        id_mahasiswa INT NOT NULL,
+        id_waktu INT NOT NULL,
+        id_nilai INT NOT NULL,
+        semester_seq INT NOT NULL,
+        ips DECIMAL(3,2) NOT NULL,
+        ipk DECIMAL(3,2) NOT NULL,
+        sks INT NOT NULL DEFAULT 0,
+        sks_lulus INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (id_mahasiswa) REFERENCES Dim_Mahasiswa(id_mahasiswa),
+        FOREIGN KEY (id_waktu) REFERENCES Dim_Waktu(id_waktu),
+        FOREIGN KEY (id_nilai) REFERENCES Dim_Nilai(id_nilai)
+    )
+"""
+
+
+def tabel_sql(fact_table, fakta_semester=False):
+    sqls = DIMENSI_SQL + [FACT_MK_SQL.replace("{fact}", fact_table)]
+    if fakta_semester:
+        sqls.append(FACT_SEMESTER_SQL)
+    return sqls
+
+
+# === Desain Index Tabel Fakta ===
+# Tabel -> [(akhiran nama, kolom kunci, kolom include)].
+# Kolom include membuat index menjadi covering untuk query insight (agregat tanpa membaca baris tabel):
+# PostgreSQL memakai INCLUDE, MySQL/MariaDB menambahkannya di ujung kunci index.
+# Index dibuat SETELAH bulk load: membangun index sekali jauh lebih murah daripada merawatnya per baris.
+INDEX_FAKTA = [
+    ("mhs_semester", ["id_mahasiswa", "semester_ordinal"], ["sks", "bobot"]),
+    ("mk_nilai", ["id_mk", "id_nilai"], ["lulus", "bobot"]),
+    ("mhs_mk_lulus", ["id_mahasiswa", "id_mk"], ["lulus"]),
+    ("waktu", ["id_waktu"], ["sks", "bobot"]),
+    ("nilai", ["id_nilai"], []),
+    # Analitik pengulangan (insight 10 & 11) cukup filter flag percobaan, tanpa anti-join
+    ("terbaik_lulus", ["percobaan_terbaik", "lulus"], ["id_mahasiswa", "id_mk"]),
+    ("terakhir_percobaan", ["percobaan_terakhir", "percobaan"], ["id_mahasiswa", "id_mk"])
+]
+
+INDEXES = {
+    "Fact_Nilai_MK": INDEX_FAKTA,
+    "Fact_Transkrip": INDEX_FAKTA,
+    "Fact_Nilai_Semester": [
+        ("mhs_seq", ["id_mahasiswa", "semester_seq"], ["ips", "ipk"]),
+        ("waktu", ["id_waktu"], ["ips"])
+    ],
+    "Dim_Waktu": [
+        ("seq", ["semester_seq"], [])
+    ]
+}
+
+# Full scan pada tabel fakta dengan estimasi baris di atas batas ini dianggap regresi plan
+BATAS_SCAN = 1000
+
+# Kata kunci SQL yang bisa muncul setelah nama tabel (bukan alias)
+KATA_KUNCI = {
+    "on", "where", "group", "order", "join", "left", "right", "inner", "outer", "cross",
+    "having", "limit", "union", "using", "natural"
+}
+TABEL_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+
+def nama_index(table, akhiran):
+    return f"idx_{table.lower()}_{akhiran}"
+
+
+def _index_ada(cursor, table, dialect):
+    if dialect == "postgres":
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (table.lower(),))
+    elif dialect == "sqlite":
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s", (table,))
+    else:
+        cursor.execute(
+            "SELECT DISTINCT index_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s", (table,)
+        )
+    return {row[0].lower() for row in cursor.fetchall()}
+
+
+# === Buat index setelah load (dilewati bila sudah ada, aman dipanggil ulang saat incremental) ===
+def buat_index(cursor, tables, dialect="mysql"):
+    dibuat = []
+    for table in tables:
+        ada = _index_ada(cursor, table, dialect)
+        for akhiran, kunci, include in INDEXES.get(table, []):
+            nama = nama_index(table, akhiran)
+            if nama in ada:
+                continue
+            if dialect == "postgres":
+                sql = f"CREATE INDEX {nama} ON {table} ({', '.join(kunci)})"
+                if include:
+                    sql += f" INCLUDE ({', '.join(include)})"
+            else:
+                sql = f"CREATE INDEX {nama} ON {table} ({', '.join(kunci + include)})"
+            cursor.execute(sql)
+            dibuat.append(nama)
+
+    if dibuat:
+        logging.info(f"🗂️ [INFO]: {len(dibuat)} index dibuat: {', '.join(dibuat)}")
+    else:
+        logging.info("🗂️ [INFO]: Semua index sudah ada.")
+    return dibuat
+
+
+def _alias_tabel(sql):
+    alias = {}
+    for table, nama in TABEL_PATTERN.findall(sql):
+        alias[table.lower()] = table
+        if nama and nama.lower() not in KATA_KUNCI:
+            alias[nama.lower()] = table
+    return alias
+
+
+def _scan_mysql(cursor, sql):
+    cursor.execute("EXPLAIN " + sql)
+    kolom = [d[0].lower() for d in cursor.description]
+    alias = _alias_tabel(sql)
+    for row in cursor.fetchall():
+        baris = dict(zip(kolom, row))
+        table = baris.get("table") or ""
+        # Tabel turunan (<derived2>, <subquery3>) dinilai dari plan tabel asalnya
+        if table.startswith("<"):
+            continue
+        yield alias.get(table.lower(), table), baris.get("type") == "ALL", int(baris.get("rows") or 0)
+
+
+def _node_postgres(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _node_postgres(child)
+
+
+def _scan_postgres(cursor, sql):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    for node in _node_postgres(plan[0]["Plan"]):
+        if "Relation Name" in node:
+            yield node["Relation Name"], node["Node Type"] == "Seq Scan", int(node.get("Plan Rows", 0))
+
+
+# === Regresi Plan: setiap insight harus memakai index atau scan terbatas ===
+# Scan penuh hanya diizinkan pada tabel dimensi/agregat (ukurannya terbatas, tidak tumbuh per transkrip).
+def periksa_plan(cursor, insights, dialect="mysql"):
+    scan = _scan_postgres if dialect == "postgres" else _scan_mysql
+    pelanggaran = []
+    for no in sorted(insights):
+        judul, sql = insights[no]
+        try:
+            for table, full_scan, rows in scan(cursor, sql):
+                if full_scan and table.lower().startswith("fact_") and rows > BATAS_SCAN:
+                    pelanggaran.append((no, judul, table, rows))
+                    logging.warning(f"🐢 [WARNING]: Insight {no} ({judul}) full scan {table} (~{rows} baris).")
+        except Exception as e:
+            pelanggaran.append((no, judul, None, 0))
+            logging.error(f"💥 [ERROR]: Insight {no} ({judul}) gagal di-EXPLAIN: {e}")
+
+    if not pelanggaran:
+        logging.info(f"🔎 [INFO]: {len(insights)} insight memakai index atau scan terbatas.")
+    return pelanggaran
+
+
+if __name__ == "__main__":
+    import mysql.connector
+    from ETL_FINAL import DB_NAME, DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Buat index DW dan periksa plan insight_transkrip.sql")
+    parser.add_argument("--buat-index", action="store_true", help="buat index yang belum ada sebelum pemeriksaan")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    # insight_transkrip.sql ditulis untuk star schema 2-fakta (ETL_FINAL.py) di MySQL/MariaDB
+    conn = mysql.connector.connect(database=DB_NAME, **DB_CONFIG)
+    cursor = conn.cursor()
+    if args.buat_index:
+        buat_index(cursor, ["Dim_Waktu", "Fact_Nilai_MK", "Fact_Nilai_Semester"])
+        conn.commit()
+    pelanggaran = periksa_plan(cursor, baca_insight())
+    cursor.close()
+    conn.close()
+    sys.exit(1 if pelanggaran else 0)
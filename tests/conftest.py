@@ -0,0 +1,39 @@
+# tests/conftest.py
+import os
+import sys
+import pytest
+
+# Modul proyek ada di root repo (flat), bukan paket terpasang
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+JUMLAH_SINTETIS = 80
+# Skenario pengulangan tetap untuk transkrip terakhir warehouse sintetis
+SKENARIO_ULANG = {"SM234101": ["E", "D", "B"], "ES234101": ["A", "C"], "UG234901": ["C", "C"]}
+
+
+# Warehouse SQLite sintetis (mode penuh): transkrip acak (MK D/E sebagian diulang) + satu skenario pengulangan tetap
+@pytest.fixture(scope="session")
+def warehouse(tmp_path_factory):
+    from backend import SQLiteBackend
+    from pipeline import LoadETL
+    from transkrip_parser import parse_transkrip
+    from transkrip_sintetis import buat_banyak, buat_transkrip
+
+    path = str(tmp_path_factory.mktemp("dw") / "dw.sqlite")
+    etl = LoadETL(SQLiteBackend(path), "2fact")
+    etl.buka()
+    for nama, halaman in buat_banyak(JUMLAH_SINTETIS):
+        etl.muat(nama, nama, parse_transkrip("\n".join(halaman)))
+    halaman = buat_transkrip(JUMLAH_SINTETIS, seed=7, percobaan=SKENARIO_ULANG)
+    etl.muat("ulang.pdf", "ulang", parse_transkrip("\n".join(halaman)))
+    etl.akhiri()
+    etl.tutup()
+    return path
+
+
+@pytest.fixture
+def cursor(warehouse):
+    from backend import SQLiteBackend
+    conn, cursor = SQLiteBackend(warehouse).buka_koneksi()
+    yield cursor
+    conn.close()
@@ -0,0 +1,119 @@
+# tests/test_ekstraksi.py
+import pytest
+import extract_pdf
+from extract_pdf import ekstrak_file, ekstrak_halaman, ekstrak_teks, StatistikEkstraksi
+from transkrip_parser import parse_transkrip
+from transkrip_sintetis import buat_transkrip, tulis_pdf
+
+BACKENDS = ["pypdf", "pdfplumber"]
+
+
+def _extractor(halaman):
+    def ekstrak(path):
+        yield from halaman
+    return ekstrak
+
+
+def _gagal(path):
+    raise ValueError("stream PDF rusak")
+    yield
+
+
+@pytest.fixture
+def transkrip():
+    return buat_transkrip(7)
+
+
+@pytest.mark.parametrize("mode", ["stream", "penuh"])
+def test_pypdf_berhasil_tanpa_fallback(monkeypatch, transkrip, mode):
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pypdf", _extractor(transkrip))
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _gagal)
+    file, record, error, info = ekstrak_file("x/t.pdf", mode, backends=BACKENDS)
+    assert (file, error, info["backend"], info["gagal"]) == ("t.pdf", None, "pypdf", [])
+    assert list(info["waktu"]) == ["pypdf"]
+    assert record == parse_transkrip("\n".join(transkrip))
+
+
+@pytest.mark.parametrize("mode", ["stream", "penuh"])
+def test_fallback_bila_teks_pypdf_tidak_bisa_diparse(monkeypatch, transkrip, mode):
+    # Teks tanpa spasi (layout hilang): NRP/Nama dan baris mata kuliah tidak dikenali
+    rusak = [text.replace(" ", "") for text in transkrip]
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pypdf", _extractor(rusak))
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _extractor(transkrip))
+    _, record, error, info = ekstrak_file("t.pdf", mode, backends=BACKENDS)
+    assert error is None and info["backend"] == "pdfplumber" and info["gagal"] == ["pypdf"]
+    assert list(info["waktu"]) == BACKENDS
+    assert record == parse_transkrip("\n".join(transkrip))
+
+    statistik = StatistikEkstraksi()
+    statistik.catat(info)
+    assert statistik.dicoba == {"pypdf": 1, "pdfplumber": 1}
+    assert statistik.hit == {"pdfplumber": 1}
+    assert statistik.gagal == {"pypdf": 1}
+
+
+def test_fallback_bila_pypdf_error(monkeypatch, transkrip):
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pypdf", _gagal)
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _extractor(transkrip))
+    _, record, error, info = ekstrak_file("t.pdf", backends=BACKENDS)
+    assert error is None and info["backend"] == "pdfplumber" and info["gagal"] == ["pypdf"]
+    assert record.nrp == parse_transkrip("\n".join(transkrip)).nrp
+
+
+def test_backend_terakhir_error_dilaporkan(monkeypatch):
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pypdf", _extractor(["bukan transkrip"]))
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _gagal)
+    _, record, error, info = ekstrak_file("t.pdf", backends=BACKENDS)
+    assert record is None and error == "stream PDF rusak"
+    # Tidak ada backend yang berhasil: tidak ada hit, kedua backend tercatat gagal
+    assert info["backend"] is None and info["gagal"] == BACKENDS
+
+    statistik = StatistikEkstraksi()
+    statistik.catat(info)
+    assert statistik.hit == {} and statistik.gagal == {"pypdf": 1, "pdfplumber": 1}
+
+
+def test_semua_backend_tanpa_mata_kuliah(monkeypatch):
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pypdf", _extractor(["bukan transkrip"]))
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _extractor(["bukan transkrip"]))
+    _, record, error, info = ekstrak_file("t.pdf", backends=BACKENDS)
+    assert (record, error, info["backend"], info["gagal"]) == (None, None, None, BACKENDS)
+
+
+# Mode stream (halaman per halaman) harus menghasilkan record yang sama dengan mode penuh (teks digabung)
+@pytest.mark.parametrize("i", range(10))
+def test_stream_sama_dengan_penuh(monkeypatch, i):
+    monkeypatch.setitem(extract_pdf.EXTRACTORS, "pdfplumber", _extractor(buat_transkrip(i)))
+    _, stream, _, info_stream = ekstrak_file("t.pdf", "stream", backends=["pdfplumber"])
+    _, penuh, _, info_penuh = ekstrak_file("t.pdf", "penuh", backends=["pdfplumber"])
+    assert stream is not None and stream == penuh
+    assert info_stream["baris"] == info_penuh["baris"]
+    # Peak memori selalu dicatat lewat getrusage; tracemalloc hanya bila diminta
+    assert info_stream["peak_mem"] is None and info_stream["rss_naik"] >= 0
+
+
+def test_pdf_sintetis_stream_sama_dengan_penuh(tmp_path):
+    pytest.importorskip("reportlab")
+    tulis_pdf(str(tmp_path), 5)
+    jumlah_halaman = 0
+    for path in sorted(tmp_path.iterdir()):
+        halaman = list(ekstrak_halaman(str(path)))
+        jumlah_halaman += len(halaman)
+        assert "\n".join(halaman) == ekstrak_teks(str(path))
+        _, stream, _, info = ekstrak_file(str(path), "stream", backends=["pdfplumber"], trace_mem=True)
+        _, penuh, _, _ = ekstrak_file(str(path), "penuh", backends=["pdfplumber"])
+        assert stream == penuh and info["peak_mem"] > 0
+    # Ada transkrip multi-halaman, jadi batas halaman ikut teruji
+    assert jumlah_halaman > 5
+
+
+# PDF asli (butuh reportlab): kedua backend menghasilkan record yang sama dengan teks sumbernya
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pdf_sintetis(tmp_path, backend):
+    pytest.importorskip("reportlab")
+    if backend == "pypdf":
+        pytest.importorskip("pypdf")
+    tulis_pdf(str(tmp_path), 1)
+    _, record, error, info = ekstrak_file(str(tmp_path / "sintetis_000000.pdf"), backends=[backend])
+    assert error is None and info["backend"] == backend
+    assert record == parse_transkrip("\n".join(buat_transkrip(0)))
@@ -0,0 +1,92 @@
+# tests/test_insight.py
+from insight_sql import baca_insight
+from fact_semester import hitung_ips_ipk
+
+INSIGHTS = baca_insight()
+
+
+def _jalankan(cursor, no):
+    cursor.execute(INSIGHTS[no][1])
+    return cursor.fetchall()
+
+
+# IPK akhir per mahasiswa dari mesin IPS/IPK (percobaan terbaik, tanpa pembulatan SQL)
+def _ipk_akhir(cursor):
+    cursor.execute("""
+        SELECT f.id_mahasiswa, f.id_mk, f.id_waktu, f.semester_ordinal, f.sks, f.bobot, f.id_nilai, f.lulus
+        FROM Fact_Nilai_MK f
+        ORDER BY f.id_mahasiswa, f.semester_ordinal, f.percobaan
+    """)
+    ipk = {}
+    for row in hitung_ips_ipk(cursor.fetchall()):
+        ipk[row[0]] = row[5]
+    cursor.execute("SELECT id_mahasiswa, nrp FROM Dim_Mahasiswa")
+    return {nrp: ipk[id_mahasiswa] for id_mahasiswa, nrp in cursor.fetchall()}
+
+
+# Agg_* di SQLite bisa tersimpan INTEGER: rasio di insight harus tetap pembagian real
+def test_ipk_agregat_sama_dengan_hitung_ips_ipk(cursor):
+    ipk = _ipk_akhir(cursor)
+    cursor.execute("SELECT m.nrp, 1.0 * a.total_bobot_terbaik / a.total_sks_terbaik FROM Agg_Mahasiswa a "
+                   "JOIN Dim_Mahasiswa m ON a.id_mahasiswa = m.id_mahasiswa")
+    agregat = dict(cursor.fetchall())
+    assert agregat.keys() == ipk.keys()
+    # Selisih hanya dari pembulatan 2 desimal hitung_ips_ipk
+    assert all(abs(agregat[nrp] - ipk[nrp]) <= 0.005 + 1e-9 for nrp in ipk)
+
+    # Insight 2 (top 10 IPK) dan insight 1 (rata-rata IPK)
+    for nrp, _, nilai in _jalankan(cursor, 2):
+        assert abs(nilai - ipk[nrp]) <= 0.01
+    rata_rata = _jalankan(cursor, 1)[0][0]
+    assert abs(rata_rata - sum(ipk.values()) / len(ipk)) <= 0.005
+
+
+def test_rata_rata_bobot_mk_bukan_pembagian_bulat(cursor):
+    cursor.execute("""
+        SELECT mk.kode_mk, AVG(f.bobot) FROM Fact_Nilai_MK f JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
+        GROUP BY mk.kode_mk
+    """)
+    rata_rata = dict(cursor.fetchall())
+    for no in (4, 5):
+        for kode_mk, _, nilai in _jalankan(cursor, no):
+            assert abs(nilai - rata_rata[kode_mk]) <= 0.005 + 1e-9
+
+
+def test_nilai_per_semester(cursor):
+    cursor.execute("""
+        SELECT w.tahun, w.semester, SUM(f.sks * f.bobot), SUM(f.sks)
+        FROM Fact_Nilai_MK f JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
+        GROUP BY w.tahun, w.semester
+    """)
+    per_semester = {(tahun, semester): (bobot, sks) for tahun, semester, bobot, sks in cursor.fetchall()}
+
+    cursor.execute("SELECT tahun, semester FROM Dim_Waktu ORDER BY semester_seq")
+    kronologis = [waktu for waktu in cursor.fetchall() if waktu in per_semester]
+
+    # Insight 7: rata-rata IPS per (tahun, semester), urut kronologis
+    hasil = _jalankan(cursor, 7)
+    assert [(tahun, semester) for tahun, semester, _ in hasil] == kronologis
+    for tahun, semester, nilai in hasil:
+        bobot, sks = per_semester[(tahun, semester)]
+        assert abs(nilai - bobot / sks) <= 0.005 + 1e-9
+
+    # Insight 6: gasal vs genap
+    for semester, nilai in _jalankan(cursor, 6):
+        bobot = sum(b for (_, smt), (b, _) in per_semester.items() if smt == semester)
+        sks = sum(s for (_, smt), (_, s) in per_semester.items() if smt == semester)
+        assert abs(nilai - bobot / sks) <= 0.005 + 1e-9
+
+
+# Insight 28: peringkat IPS dihitung per semester, baris urut kronologis lalu peringkat
+def test_ranking_ips_per_semester(cursor):
+    cursor.execute("SELECT tahun, semester FROM Dim_Waktu ORDER BY semester_seq")
+    urutan = {waktu: i for i, waktu in enumerate(cursor.fetchall())}
+    hasil = _jalankan(cursor, 28)
+    assert hasil == sorted(hasil, key=lambda row: (urutan[row[:2]], row[5]))
+
+    per_semester = {}
+    for tahun, semester, _, _, ips, peringkat in hasil:
+        per_semester.setdefault((tahun, semester), []).append((ips, peringkat))
+    for baris in per_semester.values():
+        assert baris[0][1] == 1
+        assert all(peringkat == 1 + sum(lain > ips for lain, _ in baris) for ips, peringkat in baris)
@@ -0,0 +1,38 @@
+# tests/test_ipk.py
+import pytest
+from fact_semester import hitung_ips_ipk
+from conftest import JUMLAH_SINTETIS as JUMLAH
+
+np = pytest.importorskip("numpy")
+from ipk_numpy import ambil_fakta, hitung_semester
+
+
+def _hitung_python(cursor, ids=None):
+    where = f"WHERE id_mahasiswa IN ({', '.join(['%s'] * len(ids))})" if ids else ""
+    cursor.execute(f"""
+        SELECT id_mahasiswa, id_mk, id_waktu, semester_ordinal, sks, bobot, id_nilai, lulus
+        FROM Fact_Nilai_MK {where}
+        ORDER BY id_mahasiswa, semester_ordinal, percobaan
+    """, tuple(ids or ()))
+    return hitung_ips_ipk(cursor.fetchall())
+
+
+def test_data_mengandung_pengulangan(cursor):
+    cursor.execute("SELECT COUNT(*) FROM Fact_Nilai_MK WHERE percobaan > 1")
+    assert cursor.fetchone()[0] > 0
+
+
+def test_numpy_sama_dengan_python(cursor):
+    hasil = hitung_semester(ambil_fakta(cursor))
+    assert hasil == _hitung_python(cursor)
+    assert len({row[0] for row in hasil}) == JUMLAH + 1
+
+
+def test_numpy_sama_dengan_python_sebagian(cursor):
+    ids = [1, 5, 17, JUMLAH + 1]
+    assert hitung_semester(ambil_fakta(cursor, ids)) == _hitung_python(cursor, ids)
+
+
+def test_kosong(cursor):
+    assert hitung_semester(ambil_fakta(cursor, [-1])) == []
+    assert hitung_ips_ipk([]) == []
@@ -0,0 +1,173 @@
+# tests/test_load.py
+import sqlite3
+from backend import SQLiteBackend
+from pipeline import LoadETL
+from load_manifest import hitung_delta
+from transkrip_parser import parse_transkrip, MataKuliah
+from transkrip_sintetis import buat_transkrip
+from conftest import SKENARIO_ULANG
+
+# Isi warehouse dengan kunci natural (NRP, kode MK, tahun/semester, huruf), bukan surrogate key:
+# id hasil load incremental/resume tidak harus sama dengan rebuild penuh
+SNAPSHOT = [
+    "SELECT nrp, nama, status, ipk, sks_tempuh, sks_lulus FROM Dim_Mahasiswa",
+    """SELECT m.nrp, mk.kode_mk, w.tahun, w.semester, n.huruf, f.bobot_matkul, f.lulus,
+              f.percobaan, f.percobaan_terakhir, f.percobaan_terbaik
+       FROM Fact_Nilai_MK f
+       JOIN Dim_Mahasiswa m ON f.id_mahasiswa = m.id_mahasiswa
+       JOIN Dim_MataKuliah mk ON f.id_mk = mk.id_mk
+       JOIN Dim_Waktu w ON f.id_waktu = w.id_waktu
+       JOIN Dim_Nilai n ON f.id_nilai = n.id_nilai""",
+    """SELECT m.nrp, w.tahun, w.semester, n.huruf, s.semester_seq, s.ips, s.ipk, s.sks, s.sks_lulus
+       FROM Fact_Nilai_Semester s
+       JOIN Dim_Mahasiswa m ON s.id_mahasiswa = m.id_mahasiswa
+       JOIN Dim_Waktu w ON s.id_waktu = w.id_waktu
+       JOIN Dim_Nilai n ON s.id_nilai = n.id_nilai""",
+    """SELECT m.nrp, a.total_sks, a.total_bobot, a.jumlah_mk, a.total_bobot_mentah, a.sks_lulus,
+              a.jumlah_mk_lulus, a.total_sks_terbaik, a.total_bobot_terbaik, a.sks_lulus_terbaik
+       FROM Agg_Mahasiswa a JOIN Dim_Mahasiswa m ON a.id_mahasiswa = m.id_mahasiswa""",
+    """SELECT mk.kode_mk, a.jumlah, a.total_bobot_mentah, a.lulus, a.tidak_lulus
+       FROM Agg_MataKuliah a JOIN Dim_MataKuliah mk ON a.id_mk = mk.id_mk""",
+    "SELECT w.tahun, w.semester, a.total_sks, a.total_bobot FROM Agg_Waktu a JOIN Dim_Waktu w ON a.id_waktu = w.id_waktu",
+    "SELECT n.huruf, a.jumlah FROM Agg_Nilai a JOIN Dim_Nilai n ON a.id_nilai = n.id_nilai",
+    "SELECT nama_file, file_hash, nrp FROM Load_Manifest",
+]
+
+
+def _record(i, **kwargs):
+    return parse_transkrip("\n".join(buat_transkrip(i, **kwargs)))
+
+
+def _snapshot(path):
+    conn = sqlite3.connect(path)
+    # Jumlah desimal bisa berbeda di digit terakhir karena urutan penjumlahan
+    hasil = [sorted(tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in conn.execute(sql))
+             for sql in SNAPSHOT]
+    conn.close()
+    return hasil
+
+
+def _muat_penuh(path, files):
+    etl = LoadETL(SQLiteBackend(path), "2fact")
+    etl.buka()
+    for nama_file, (file_hash, record) in files.items():
+        assert etl.muat(nama_file, file_hash, record)
+    etl.akhiri()
+    etl.tutup()
+
+
+# Satu run incremental seperti jalankan_etl: delta manifest, hapus file yang hilang, muat baru + berubah
+def _muat_incremental(path, files):
+    etl = LoadETL(SQLiteBackend(path), "2fact", incremental=True)
+    etl.buka()
+    delta = hitung_delta(etl.manifest, {nama_file: file_hash for nama_file, (file_hash, _) in files.items()})
+    etl.hapus_file(delta["dihapus"])
+    for nama_file in delta["baru"] + delta["berubah"]:
+        assert etl.muat(nama_file, *files[nama_file])
+    etl.akhiri()
+    etl.tutup()
+    return delta
+
+
+def test_incremental_sama_dengan_rebuild_penuh(tmp_path):
+    files = {f"t{i}.pdf": (f"h{i}", _record(i)) for i in range(8)}
+    path = str(tmp_path / "incremental.sqlite")
+    assert sorted(_muat_incremental(path, files)["baru"]) == sorted(files)
+
+    # t2 dihapus, t5 berubah (NRP sama, nilai lain), t6 diganti transkrip NRP lain, t8 baru
+    del files["t2.pdf"]
+    files["t5.pdf"] = ("h5b", _record(5, percobaan=SKENARIO_ULANG))
+    files["t6.pdf"] = ("h6b", _record(106))
+    files["t8.pdf"] = ("h8", _record(8))
+    assert files["t5.pdf"][1].nrp == _record(5).nrp and files["t6.pdf"][1].nrp != _record(6).nrp
+    delta = _muat_incremental(path, files)
+    assert (delta["baru"], sorted(delta["berubah"]), delta["dihapus"]) == (["t8.pdf"], ["t5.pdf", "t6.pdf"], ["t2.pdf"])
+
+    penuh = str(tmp_path / "penuh.sqlite")
+    _muat_penuh(penuh, files)
+    assert _snapshot(path) == _snapshot(penuh)
+    # Run berikutnya tanpa perubahan tidak memuat apa pun
+    assert _muat_incremental(path, files)["tetap"] and _snapshot(path) == _snapshot(penuh)
+
+
+def test_savepoint_membuang_dimensi_baru_file_gagal(tmp_path):
+    path = str(tmp_path / "dw.sqlite")
+    etl = LoadETL(SQLiteBackend(path), "2fact", commit_every=10)
+    etl.buka()
+    assert etl.muat("a.pdf", "ha", _record(0))
+
+    # NRP dipakai ulang di mode penuh: flush fakta melanggar unique_transkrip setelah MK & waktu baru dibuat
+    gagal = _record(0)
+    gagal.mata_kuliah.append(MataKuliah("XX999999", "Mata Kuliah Baru", 3, 2030, "Gasal", "A", "Sarjana"))
+    assert not etl.muat("b.pdf", "hb", gagal)
+
+    # File berikutnya membuat dimensi baru lagi: id yang di-rollback tidak boleh tersisa di cache dimensi
+    record = _record(1)
+    record.mata_kuliah += [MataKuliah("YY888888", "Mata Kuliah Lain", 2, 2031, "Genap", "B", "Sarjana"),
+                           MataKuliah("XX999999", "Mata Kuliah Baru", 3, 2030, "Gasal", "A", "Sarjana")]
+    assert etl.muat("c.pdf", "hc", record)
+    etl.akhiri()
+    etl.tutup()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT nama_file, status FROM ETL_Progress ORDER BY nama_file").fetchall() == [
+        ("a.pdf", "selesai"), ("b.pdf", "gagal"), ("c.pdf", "selesai")]
+    assert conn.execute("SELECT nama_file FROM Load_Manifest ORDER BY nama_file").fetchall() == [("a.pdf",), ("c.pdf",)]
+    assert conn.execute("SELECT COUNT(*) FROM Dim_Mahasiswa").fetchone()[0] == 2
+    conn.close()
+    # Isi warehouse sama dengan hanya memuat file yang berhasil
+    penuh = str(tmp_path / "penuh.sqlite")
+    _muat_penuh(penuh, {"a.pdf": ("ha", _record(0)), "c.pdf": ("hc", record)})
+    assert _snapshot(path) == _snapshot(penuh)
+
+
+def test_savepoint_rollback_dimensi_baru_tidak_tersimpan(tmp_path):
+    path = str(tmp_path / "dw.sqlite")
+    etl = LoadETL(SQLiteBackend(path), "2fact", commit_every=10)
+    etl.buka()
+    assert etl.muat("a.pdf", "ha", _record(0))
+    etl.commit()
+    gagal = _record(0)
+    gagal.mata_kuliah.append(MataKuliah("XX999999", "Mata Kuliah Baru", 3, 2030, "Gasal", "A", "Sarjana"))
+    assert not etl.muat("b.pdf", "hb", gagal)
+    etl.commit()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM Dim_MataKuliah WHERE kode_mk = 'XX999999'").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM Dim_Waktu WHERE tahun = 2030").fetchone()[0] == 0
+    conn.close()
+    etl.tutup()
+
+
+def test_resume_melewati_file_yang_sudah_commit(tmp_path):
+    files = {f"t{i}.pdf": (f"h{i}", _record(i)) for i in range(8)}
+    nama_files = list(files)
+    path = str(tmp_path / "dw.sqlite")
+
+    # Proses mati setelah 7 file: batch 1-3 dan 4-6 sudah di-commit, file ke-7 belum
+    etl = LoadETL(SQLiteBackend(path), "2fact", commit_every=3)
+    etl.buka()
+    run_id = etl.run_id
+    for nama_file in nama_files[:7]:
+        assert etl.muat(nama_file, *files[nama_file])
+    etl.tutup()
+
+    etl = LoadETL(SQLiteBackend(path), "2fact", resume=True, commit_every=3)
+    assert etl.buka()
+    assert etl.run_id == run_id and etl.selesai == set(nama_files[:6])
+    sisa = [nama_file for nama_file in nama_files if nama_file not in etl.selesai]
+    assert sisa == nama_files[6:]
+    for nama_file in sisa:
+        assert etl.muat(nama_file, *files[nama_file])
+    etl.akhiri()
+    etl.tutup()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT run_id, status, jumlah_file FROM ETL_Run").fetchall() == [(run_id, "selesai", 8)]
+    conn.close()
+    penuh = str(tmp_path / "penuh.sqlite")
+    _muat_penuh(penuh, files)
+    assert _snapshot(path) == _snapshot(penuh)
+
+    # Tidak ada run terhenti lagi: resume berikutnya tidak melakukan apa pun
+    assert not LoadETL(SQLiteBackend(path), "2fact", resume=True).buka()
@@ -0,0 +1,126 @@
+# tests/test_parser.py
+import re
+from transkrip_parser import parse_transkrip, TranskripStream, MataKuliah, SEMESTER
+from transkrip_sintetis import buat_transkrip
+
+JUMLAH = 40
+
+# MK tahap persiapan yang diulang di seksi Sarjana: tiap baris harus mendapat tahap seksinya sendiri
+TRANSKRIP_ULANG_LINTAS_TAHAP = """TRANSKRIP AKADEMIK
+NRP / Nama 5026211000001 / Budi Santoso
+SKS Tempuh / SKS Lulus 14 / 11
+Status Aktif ---
+Tahap: Persiapan
+Kode Nama Mata Kuliah SKS Historis Nilai Nilai
+SM234101 Kalkulus 1 3 2021/Gs/A E
+ES234101 Dasar Pemrograman 4 2021/Gs/B B
+Total Sks Tahap Persiapan : 7
+IP Tahap Persiapan : 1.71
+Tahap: Sarjana
+Kode Nama Mata Kuliah SKS Historis Nilai Nilai
+ES234301 Basis Data 4 2022/Gs/A A
+SM234101 Kalkulus 1 3 2022/Gn/B C
+Total Sks Tahap Sarjana : 7
+IP Tahap Sarjana : 3.14
+IPK 2.43"""
+
+
+# === Parser baseline: regex per field seperti skrip ETL awal (ETL_FINAL.py) ===
+def _cari(pola, text, flags=0, default=None, ubah=str):
+    m = re.search(pola, text, flags)
+    return ubah(m.group(1)) if m else default
+
+
+def parse_baseline(text):
+    m = re.search(r"NRP\s*/\s*Nama\s*(\d+)\s*/\s*(.*?)\s*SKS Tempuh", text, re.DOTALL)
+    if not m:
+        return None
+    sks = re.search(r"SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(\d+)\s*/\s*(\d+)", text)
+    header = {
+        "nrp": m.group(1).strip(),
+        "nama": m.group(2).strip(),
+        "ipk": _cari(r"IPK\s+(\d+\.\d+)", text, default=0.0, ubah=float),
+        "status": _cari(r"Status\s+(.*?)---", text, re.DOTALL, "-", lambda s: s.strip()),
+        "ip_persiapan": _cari(r"IP Tahap Persiapan\s*:\s*(\d+\.\d+)", text, default=0.0, ubah=float),
+        "ip_sarjana": _cari(r"IP Tahap Sarjana\s*:\s*(\d+\.\d+)", text, default=0.0, ubah=float),
+        "sks_tempuh": int(sks.group(1)) if sks else 0,
+        "sks_lulus": int(sks.group(2)) if sks else 0,
+        "sks_persiapan": _cari(r"Total Sks Tahap Persiapan\s*:\s*(\d+)", text, re.IGNORECASE, 0, int),
+        "sks_sarjana": _cari(r"Total Sks Tahap Sarjana\s*:\s*(\d+)", text, re.IGNORECASE, 0, int),
+    }
+    regex_mk = r"([A-Z]{2}\d{6})\s+(.+?)\s+(\d)\s+(\d{4})/(Gs|Gn)/[A-Z]{0,2}\s+([A-Z]{1,2})"
+    mata_kuliah = []
+    for m in re.finditer(regex_mk, text):
+        kode_mk, nama_mk, sks_mk, tahun, smt, nilai = m.groups()
+        # Tahap dari header "Tahap:" terakhir sebelum baris ini (bukan kemunculan pertama kode MK)
+        sarjana = text.rfind("Tahap: Sarjana", 0, m.start()) > text.rfind("Tahap: Persiapan", 0, m.start())
+        mata_kuliah.append(MataKuliah(kode_mk, nama_mk.strip(), int(sks_mk), int(tahun), SEMESTER[smt], nilai,
+                                      "Sarjana" if sarjana else "Persiapan"))
+    return header, mata_kuliah
+
+
+def _stream(halaman):
+    parser = TranskripStream()
+    mata_kuliah = []
+    for text in halaman:
+        mata_kuliah.extend(parser.feed(text))
+    mata_kuliah.extend(parser.selesai())
+    return parser.hasil(mata_kuliah)
+
+
+def _potong(text, ukuran):
+    # Halaman buatan dengan batas di tengah baris (termasuk di tengah header NRP/Nama dan baris MK)
+    return [text[i:i + ukuran] for i in range(0, len(text), ukuran)]
+
+
+def test_parse_transkrip_sama_dengan_baseline():
+    for i in range(JUMLAH):
+        text = "\n".join(buat_transkrip(i))
+        record = parse_transkrip(text)
+        header, mata_kuliah = parse_baseline(text)
+        assert {k: v for k, v in record.to_dict().items() if k != "mata_kuliah"} == header
+        assert record.mata_kuliah == mata_kuliah
+
+
+def test_mk_diulang_lintas_tahap():
+    harapan = [
+        MataKuliah("SM234101", "Kalkulus 1", 3, 2021, "Gasal", "E", "Persiapan"),
+        MataKuliah("ES234101", "Dasar Pemrograman", 4, 2021, "Gasal", "B", "Persiapan"),
+        MataKuliah("ES234301", "Basis Data", 4, 2022, "Gasal", "A", "Sarjana"),
+        MataKuliah("SM234101", "Kalkulus 1", 3, 2022, "Genap", "C", "Sarjana"),
+    ]
+    text = TRANSKRIP_ULANG_LINTAS_TAHAP
+    assert parse_transkrip(text).mata_kuliah == harapan
+    assert parse_baseline(text)[1] == harapan
+    baris = text.splitlines()
+    # Batas halaman tepat sebelum header "Tahap: Sarjana" dan di antara dua baris MK Sarjana
+    for halaman in ([text], baris, ["\n".join(baris[:10]), "\n".join(baris[10:13]), "\n".join(baris[13:])]):
+        assert _stream(halaman).mata_kuliah == harapan
+
+
+def test_tanpa_nrp_none():
+    text = "\n".join(buat_transkrip(0)).replace("NRP / Nama", "Nomor / Nama")
+    assert parse_transkrip(text) is None
+    assert parse_baseline(text) is None
+    assert _stream([text]) is None
+
+
+def test_stream_sama_dengan_dokumen_utuh():
+    for i in range(JUMLAH):
+        halaman = buat_transkrip(i)
+        assert _stream(halaman) == parse_transkrip("\n".join(halaman))
+
+
+def test_stream_baris_terpotong_antar_halaman():
+    text = "\n".join(buat_transkrip(3))
+    for ukuran in (7, 31, 64, 200, 1000):
+        halaman = _potong(text, ukuran)
+        assert _stream(halaman) == parse_transkrip("\n".join(halaman))
+
+
+def test_stream_kode_prefix():
+    halaman = buat_transkrip(5)
+    parser = TranskripStream(kode_prefix="ES")
+    record = parser.hasil([mk for text in halaman for mk in parser.feed(text)] + list(parser.selesai()))
+    assert record.mata_kuliah == parse_transkrip("\n".join(halaman), kode_prefix="ES").mata_kuliah
+    assert record.mata_kuliah and all(mk.kode_mk.startswith("ES") for mk in record.mata_kuliah)
@@ -0,0 +1,91 @@
+# transaksi.py
+import logging
+from contextlib import nullcontext
+
+# Jumlah file per transaksi; crash hanya kehilangan batch yang belum di-commit
+COMMIT_EVERY = 20
+
+SAVEPOINT = "sp_file"
+
+
+# === Transaksi Batch: commit tiap N file, SAVEPOINT per file ===
+# Baris fakta file di-flush di dalam SAVEPOINT-nya (sebelum RELEASE), sehingga error flush seperti
+# pelanggaran unique hanya membatalkan file itu lewat batal_file, bukan seluruh batch.
+class TransaksiManager:
+    def __init__(self, backend, commit_every=COMMIT_EVERY, loaders=(), caches=(), instrumentasi=None):
+        self.backend = backend
+        self.commit_every = commit_every
+        self.loaders = list(loaders)
+        self.caches = list(caches)
+        self.instrumentasi = instrumentasi
+        self.file_batch = []
+        self.tanda = []
+        self.aktif = None
+        self.commit_total = 0
+        self.dibatalkan = []
+
+    # Flush & commit di batas transaksi dicatat sebagai tahap batch (tidak dibebankan ke satu file)
+    def _tahap(self, nama, baris=0):
+        if self.instrumentasi is None:
+            return nullcontext()
+        return self.instrumentasi.tahap(nama, baris, batch=True)
+
+    def mulai_file(self, file):
+        with self._tahap("commit"):
+            self.backend.mulai_transaksi()
+            self.backend.cursor.execute(f"SAVEPOINT {SAVEPOINT}")
+        self.tanda = [loader.tandai() for loader in self.loaders]
+        self.aktif = file
+
+    # Sisa buffer di-flush sebelum RELEASE; error di sini masih di dalam savepoint file, pemanggil cukup batal_file
+    def selesai_file(self):
+        for loader in self.loaders:
+            if loader.rows:
+                with self._tahap("fakta", len(loader.rows)):
+                    loader.flush()
+        with self._tahap("commit"):
+            self.backend.cursor.execute(f"RELEASE SAVEPOINT {SAVEPOINT}")
+        self.file_batch.append(self.aktif)
+        self.aktif = None
+
+    def batch_penuh(self):
+        return len(self.file_batch) >= self.commit_every
+
+    # Hanya file yang gagal yang dibatalkan; file lain di batch tetap utuh
+    def batal_file(self):
+        self.backend.cursor.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+        self.backend.cursor.execute(f"RELEASE SAVEPOINT {SAVEPOINT}")
+        for loader, tanda in zip(self.loaders, self.tanda):
+            loader.kembali_ke(tanda)
+        # Anggota dimensi yang di-insert file ini ikut ter-rollback
+        for cache in self.caches:
+            cache.preload()
+        self.aktif = None
+
+    # False bila COMMIT gagal; file batch yang ikut hilang ada di self.dibatalkan
+    def commit(self):
+        self.dibatalkan = []
+        try:
+            with self._tahap("commit"):
+                self.backend.commit()
+        except Exception as e:
+            self.dibatalkan = self.batal_batch(e)
+            return False
+        if self.file_batch:
+            self.commit_total += 1
+            logging.info(f"💾 [INFO]: Commit batch ke-{self.commit_total} ({len(self.file_batch)} file).")
+        self.file_batch.clear()
+        return True
+
+    # COMMIT gagal (mis. koneksi putus): seluruh batch yang belum di-commit ikut hilang
+    def batal_batch(self, e):
+        self.backend.rollback()
+        for loader in self.loaders:
+            loader.clear()
+        for cache in self.caches:
+            cache.preload()
+        dibatalkan = list(self.file_batch)
+        logging.error(f"💥 [ERROR]: Commit batch gagal ({e}); {len(dibatalkan)} file dibatalkan: {', '.join(dibatalkan)}")
+        self.file_batch.clear()
+        self.aktif = None
+        return dibatalkan
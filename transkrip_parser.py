@@ -0,0 +1,202 @@
+# transkrip_parser.py
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field, asdict
+from typing import NamedTuple
+
+# Naikkan setiap kali regex/format record atau backend ekstraksi berubah agar cache ekstraksi lama tidak dipakai
+PARSER_VERSION = 4
+
+# === Pola Token (dikompilasi sekali, dipindai sekali per teks) ===
+# Field header yang bisa melintasi baris ditangkap di dalam lookahead supaya
+# baris mata kuliah di dalam rentang tersebut tetap ikut terpindai.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<mk>(?P<kode_mk>[A-Z]{2}\d{6})\s+(?P<nama_mk>.+?)\s+(?P<sks>\d)\s+(?P<tahun>\d{4})/(?P<smt>Gs|Gn)/[A-Z]{0,2}\s+(?P<nilai>[A-Z]{1,2}))
+  | (?P<nrp_nama>NRP(?=\s*/\s*Nama\s*(?P<nrp>\d+)\s*/\s*(?P<nama>(?s:.*?))\s*SKS\ Tempuh))
+  | (?P<sks_tempuh_lulus>SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(?P<sks_tempuh>\d+)\s*/\s*(?P<sks_lulus>\d+))
+  | (?P<ip_persiapan_tok>IP\ Tahap\ Persiapan\s*:\s*(?P<ip_persiapan>\d+\.\d+))
+  | (?P<ip_sarjana_tok>IP\ Tahap\ Sarjana\s*:\s*(?P<ip_sarjana>\d+\.\d+))
+  | (?P<ipk_tok>IPK\s+(?P<ipk>\d+\.\d+))
+  | (?P<sks_persiapan_tok>(?i:Total\ Sks\ Tahap\ Persiapan)\s*:\s*(?P<sks_persiapan>\d+))
+  | (?P<sks_sarjana_tok>(?i:Total\ Sks\ Tahap\ Sarjana)\s*:\s*(?P<sks_sarjana>\d+))
+  | (?P<status_tok>Status(?=\s+(?P<status>(?s:.*?))---))
+  | (?P<tahap_tok>Tahap:\s*(?P<tahap>Persiapan|Sarjana))
+""", re.VERBOSE)
+
+SEMESTER = {"Gs": "Gasal", "Gn": "Genap"}
+# Gasal tahun X (mulai Agustus) selalu mendahului Genap tahun X (mulai Februari X+1)
+SEMESTER_URUT = {"Gasal": 0, "Genap": 1}
+
+
+# === Ordinal Semester Kronologis (bisa diurutkan sebagai integer) ===
+def semester_ordinal(tahun, semester):
+    return tahun * 2 + SEMESTER_URUT[semester]
+
+
+class MataKuliah(NamedTuple):
+    kode_mk: str
+    nama_mk: str
+    sks: int
+    tahun: int
+    semester: str
+    nilai: str
+    tahap: str
+
+
+@dataclass
+class Transkrip:
+    nrp: str
+    nama: str
+    ipk: float = 0.0
+    status: str = "-"
+    ip_persiapan: float = 0.0
+    ip_sarjana: float = 0.0
+    sks_tempuh: int = 0
+    sks_lulus: int = 0
+    sks_persiapan: int = 0
+    sks_sarjana: int = 0
+    mata_kuliah: list = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        if data is None:
+            return None
+        data = dict(data)
+        data["mata_kuliah"] = [MataKuliah(*mk) for mk in data["mata_kuliah"]]
+        return cls(**data)
+
+
+def _catat_header(header, jenis, m):
+    # Hanya kemunculan pertama tiap field yang dipakai (setara re.search)
+    if jenis == "nrp_nama":
+        header.setdefault("nrp", m.group("nrp").strip())
+        header.setdefault("nama", m.group("nama").strip())
+    elif jenis == "sks_tempuh_lulus":
+        header.setdefault("sks_tempuh", int(m.group("sks_tempuh")))
+        header.setdefault("sks_lulus", int(m.group("sks_lulus")))
+    elif jenis == "status_tok":
+        header.setdefault("status", m.group("status").strip())
+    elif jenis in ("ipk_tok", "ip_persiapan_tok", "ip_sarjana_tok"):
+        key = jenis[:-4]
+        header.setdefault(key, float(m.group(key)))
+    else:
+        key = jenis[:-4]
+        header.setdefault(key, int(m.group(key)))
+
+
+def _mata_kuliah(m, tahap):
+    return MataKuliah(
+        m.group("kode_mk"), m.group("nama_mk").strip(), int(m.group("sks")), int(m.group("tahun")),
+        SEMESTER[m.group("smt")], m.group("nilai"), tahap
+    )
+
+
+# === Transform Teks Transkrip menjadi Record (satu kali pindai) ===
+def parse_transkrip(text, kode_prefix=None):
+    header = {}
+    rows = []
+    # Indeks seksi: offset tiap header "Tahap:" (terurut karena dipindai maju) dan nama tahapnya
+    tahap_offsets = []
+    tahap_nama = []
+
+    for m in TOKEN_PATTERN.finditer(text):
+        jenis = m.lastgroup
+        if jenis == "mk":
+            rows.append(m)
+        elif jenis == "tahap_tok":
+            tahap_offsets.append(m.start())
+            tahap_nama.append(m.group("tahap"))
+        else:
+            _catat_header(header, jenis, m)
+
+    if "nrp" not in header:
+        return None
+
+    mata_kuliah = []
+    for m in rows:
+        if kode_prefix and not m.group("kode_mk").startswith(kode_prefix):
+            continue
+        # Tahap diambil dari header "Tahap:" terakhir sebelum posisi baris ini sendiri,
+        # sehingga mata kuliah yang diulang di seksi lain mendapat tahap yang benar
+        seksi = bisect_right(tahap_offsets, m.start()) - 1
+        mata_kuliah.append(_mata_kuliah(m, tahap_nama[seksi] if seksi >= 0 else "Persiapan"))
+
+    return Transkrip(mata_kuliah=mata_kuliah, **header)
+
+
+# === Parser Streaming: teks diumpankan per halaman, baris MK di-yield saat dikenali ===
+# Batas teks yang boleh ditahan selama menunggu penutup field header multi-baris (NRP/Nama, Status)
+MAX_TUNDA = 16 * 1024
+
+
+class TranskripStream:
+    def __init__(self, kode_prefix=None):
+        self.kode_prefix = kode_prefix
+        self.header = {}
+        # Token diproses berurutan, jadi seksi aktif cukup header "Tahap:" terakhir yang terlihat
+        self.tahap = "Persiapan"
+        self.sisa = ""
+        # Panjang awal self.sisa yang baris MK/Tahap-nya sudah diproses pada pindaian sebelumnya
+        self.lewati = 0
+        self.halaman = 0
+
+    def _tertunda(self, buffer):
+        # Posisi awal field header multi-baris yang penutupnya belum terlihat
+        posisi = []
+        if "nrp" not in self.header and "NRP" in buffer:
+            posisi.append(buffer.index("NRP"))
+        if "status" not in self.header and "Status" in buffer:
+            posisi.append(buffer.index("Status"))
+        return min(posisi, default=None)
+
+    def _pindai(self, text, akhir):
+        buffer = self.sisa + text
+        # Baris terakhir ditahan sampai halaman berikutnya, siapa tahu barisnya terpotong
+        batas = len(buffer) if akhir else buffer.rfind("\n") + 1
+        last_end = 0
+
+        for m in TOKEN_PATTERN.finditer(buffer):
+            if m.start() >= batas:
+                break
+            last_end = m.end()
+            jenis = m.lastgroup
+            if jenis == "mk":
+                if m.start() < self.lewati:
+                    continue
+                if not self.kode_prefix or m.group("kode_mk").startswith(self.kode_prefix):
+                    yield _mata_kuliah(m, self.tahap)
+            elif jenis == "tahap_tok":
+                if m.start() >= self.lewati:
+                    self.tahap = m.group("tahap")
+            else:
+                _catat_header(self.header, jenis, m)
+
+        if akhir:
+            self.sisa, self.lewati = "", 0
+            return
+        potong = max(batas, last_end)
+        tunda = self._tertunda(buffer)
+        if tunda is not None and tunda < potong and potong - tunda <= MAX_TUNDA:
+            self.sisa, self.lewati = buffer[tunda:], potong - tunda
+        else:
+            self.sisa, self.lewati = buffer[potong:], 0
+
+    def feed(self, text):
+        # Satu panggilan = satu halaman; antar halaman disambung "\n" seperti ekstraksi penuh
+        if self.halaman:
+            text = "\n" + text
+        self.halaman += 1
+        return self._pindai(text, akhir=False)
+
+    def selesai(self):
+        return self._pindai("", akhir=True)
+
+    def hasil(self, mata_kuliah):
+        # Habiskan generator dulu: header baru lengkap setelah seluruh halaman terpindai
+        mata_kuliah = list(mata_kuliah)
+        if "nrp" not in self.header:
+            return None
+        return Transkrip(mata_kuliah=mata_kuliah, **self.header)
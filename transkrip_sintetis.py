@@ -0,0 +1,171 @@
+# transkrip_sintetis.py
+import os
+import random
+import argparse
+
+# === Generator Transkrip Sintetis (layout sama dengan teks hasil ekstraksi PDF asli) ===
+# Deterministik per seed, supaya benchmark bisa diulang dan dibagikan tanpa data mahasiswa asli.
+SEED = 2024
+
+# Baris teks per halaman; transkrip dipecah jadi beberapa halaman seperti PDF asli
+BARIS_PER_HALAMAN = 45
+
+# Distribusi nilai (huruf, bobot kemunculan)
+DISTRIBUSI_NILAI = [("A", 30), ("AB", 20), ("B", 20), ("BC", 10), ("C", 10), ("D", 6), ("E", 4)]
+NILAI_BOBOT = {"A": 4.0, "AB": 3.5, "B": 3.0, "BC": 2.5, "C": 2.0, "D": 1.0, "E": 0.0}
+# Peluang mata kuliah tidak lulus (D/E) diulang pada tahun berikutnya
+PELUANG_ULANG = 0.7
+
+NAMA_DEPAN = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fajar", "Gita", "Hadi", "Indah", "Joko", "Kartika", "Lukman",
+              "Maya", "Nanda", "Oki", "Putri", "Rizky", "Sari", "Tono", "Wulan"]
+NAMA_BELAKANG = ["Pratama", "Saputra", "Wijaya", "Lestari", "Santoso", "Hidayat", "Kusuma", "Nugroho", "Rahmawati",
+                 "Setiawan", "Permata", "Siregar"]
+STATUS = ["Aktif", "Aktif", "Aktif", "Lulus", "Cuti"]
+
+# Katalog mata kuliah per tahap: (kode_mk, nama_mk, sks)
+KATALOG = {
+    "Persiapan": [
+        ("SM234101", "Kalkulus 1", 3), ("SM234102", "Fisika 1", 4), ("SM234103", "Kimia", 3),
+        ("ES234101", "Dasar Pemrograman", 4), ("ES234102", "Pengantar Sistem Informasi", 3),
+        ("UG234901", "Agama", 2), ("UG234902", "Pancasila", 2), ("UG234903", "Bahasa Indonesia", 2),
+        ("SM234201", "Kalkulus 2", 3), ("SM234202", "Fisika 2", 3), ("ES234201", "Struktur Data", 4),
+        ("ES234202", "Matematika Diskrit", 3), ("UG234904", "Kewarganegaraan", 2), ("UG234905", "Bahasa Inggris", 2),
+    ],
+    "Sarjana": [
+        ("ES234301", "Basis Data", 4), ("ES234302", "Sistem Operasi", 3), ("ES234303", "Statistika", 3),
+        ("ES234304", "Analisis Sistem", 3), ("ES234305", "Jaringan Komputer", 3), ("ES234306", "Pemrograman Web", 3),
+        ("ES234401", "Rekayasa Perangkat Lunak", 3), ("ES234402", "Data Warehouse", 3),
+        ("ES234403", "Manajemen Proyek", 3), ("ES234404", "Interaksi Manusia Komputer", 3),
+        ("ES234405", "Keamanan Aset Informasi", 3), ("ES234406", "Sistem Enterprise", 3),
+        ("ES234501", "Penggalian Data", 3), ("ES234502", "Tata Kelola TI", 3), ("ES234503", "Audit Sistem", 3),
+        ("ES234504", "Kecerdasan Bisnis", 3), ("ES234505", "Pemrograman Perangkat Bergerak", 3),
+        ("ES234506", "Arsitektur Enterprise", 3), ("ES234601", "Metodologi Penelitian", 2),
+        ("ES234602", "Kerja Praktik", 2), ("ES234603", "Big Data", 3), ("ES234604", "Optimasi", 3),
+        ("EE234601", "Sistem Digital", 3), ("EE234602", "Internet of Things", 3), ("ES234701", "Tugas Akhir", 6),
+    ]
+}
+# Semester 1-2 tahap Persiapan, sisanya tahap Sarjana
+SEMESTER_PERSIAPAN = 2
+JUMLAH_SEMESTER = 8
+
+
+def _nilai(rng):
+    huruf, bobot = zip(*DISTRIBUSI_NILAI)
+    return rng.choices(huruf, bobot)[0]
+
+
+def _kode_semester(angkatan, ke):
+    # Semester ke-1 = Gasal tahun angkatan, ke-2 = Genap tahun yang sama (format transkrip: 2023/Gs, 2023/Gn)
+    tahun = angkatan + (ke - 1) // 2
+    return tahun, "Gs" if ke % 2 else "Gn"
+
+
+# === Satu Transkrip: daftar halaman teks ===
+# percobaan: skenario pengulangan tetap {kode_mk: [nilai percobaan 1, nilai percobaan 2, ...]}, tiap percobaan
+# berikutnya dua semester setelahnya (dipotong di semester terakhir); MK lain tetap acak
+def buat_transkrip(i, seed=SEED, tahun_akhir=2024, percobaan=None):
+    rng = random.Random(f"{seed}-{i}")
+    angkatan = rng.randint(tahun_akhir - 6, tahun_akhir - 1)
+    nrp = f"50262{angkatan % 100:02d}{i:06d}"
+    nama = f"{rng.choice(NAMA_DEPAN)} {rng.choice(NAMA_BELAKANG)}"
+    jumlah_semester = min(JUMLAH_SEMESTER, (tahun_akhir - angkatan) * 2)
+
+    # Mata kuliah dibagi rata ke semester per tahap; mata kuliah tidak lulus bisa diulang setahun kemudian
+    per_semester = {ke: [] for ke in range(1, jumlah_semester + 1)}
+    for tahap, semester in (("Persiapan", range(1, SEMESTER_PERSIAPAN + 1)),
+                            ("Sarjana", range(SEMESTER_PERSIAPAN + 1, JUMLAH_SEMESTER + 1))):
+        katalog = KATALOG[tahap]
+        for j, mk in enumerate(katalog):
+            ke = semester[j * len(semester) // len(katalog)]
+            if ke > jumlah_semester:
+                continue
+            if percobaan and mk[0] in percobaan:
+                for k, nilai in enumerate(percobaan[mk[0]]):
+                    if ke + 2 * k <= jumlah_semester:
+                        per_semester[ke + 2 * k].append((mk, nilai, tahap))
+                continue
+            nilai = _nilai(rng)
+            per_semester[ke].append((mk, nilai, tahap))
+            if NILAI_BOBOT[nilai] < 2.0 and ke + 2 <= jumlah_semester and rng.random() < PELUANG_ULANG:
+                per_semester[ke + 2].append((mk, rng.choice(["A", "AB", "B", "BC", "C"]), tahap))
+
+    seksi = {"Persiapan": [], "Sarjana": []}
+    sks_tahap = {"Persiapan": 0, "Sarjana": 0}
+    bobot_tahap = {"Persiapan": 0.0, "Sarjana": 0.0}
+    sks_lulus = 0
+    for ke, daftar in per_semester.items():
+        tahun, smt = _kode_semester(angkatan, ke)
+        for (kode_mk, nama_mk, sks), nilai, tahap in daftar:
+            seksi[tahap].append(f"{kode_mk} {nama_mk} {sks} {tahun}/{smt}/{rng.choice(['', 'A', 'B', 'IF'])} {nilai}")
+            sks_tahap[tahap] += sks
+            bobot_tahap[tahap] += sks * NILAI_BOBOT[nilai]
+            sks_lulus += sks if NILAI_BOBOT[nilai] >= 2.0 else 0
+
+    sks_tempuh = sum(sks_tahap.values())
+    ip = {tahap: bobot_tahap[tahap] / sks_tahap[tahap] if sks_tahap[tahap] else 0.0 for tahap in seksi}
+    ipk = sum(bobot_tahap.values()) / sks_tempuh if sks_tempuh else 0.0
+
+    baris = [
+        "KEMENTERIAN PENDIDIKAN, KEBUDAYAAN, RISET, DAN TEKNOLOGI",
+        "TRANSKRIP AKADEMIK",
+        f"NRP / Nama {nrp} / {nama}",
+        f"SKS Tempuh / SKS Lulus {sks_tempuh} / {sks_lulus}",
+        f"Status {rng.choice(STATUS)} ---",
+        "Tahap: Persiapan",
+        "Kode Nama Mata Kuliah SKS Historis Nilai Nilai",
+        *seksi["Persiapan"],
+        f"Total Sks Tahap Persiapan : {sks_tahap['Persiapan']}",
+        f"IP Tahap Persiapan : {ip['Persiapan']:.2f}",
+        "Tahap: Sarjana",
+        "Kode Nama Mata Kuliah SKS Historis Nilai Nilai",
+        *seksi["Sarjana"],
+        f"Total Sks Tahap Sarjana : {sks_tahap['Sarjana']}",
+        f"IP Tahap Sarjana : {ip['Sarjana']:.2f}",
+        f"IPK {ipk:.2f}",
+    ]
+    return ["\n".join(baris[j:j + BARIS_PER_HALAMAN]) for j in range(0, len(baris), BARIS_PER_HALAMAN)]
+
+
+def buat_banyak(jumlah, seed=SEED):
+    for i in range(jumlah):
+        yield f"sintetis_{i:06d}.pdf", buat_transkrip(i, seed)
+
+
+# === Tulis ke Folder: teks hasil ekstraksi (.txt, halaman dipisah form feed) atau PDF asli ===
+def tulis_teks(folder_path, jumlah, seed=SEED):
+    os.makedirs(folder_path, exist_ok=True)
+    for nama, halaman in buat_banyak(jumlah, seed):
+        with open(os.path.join(folder_path, nama[:-4] + ".txt"), "w", encoding="utf-8") as f:
+            f.write("\f".join(halaman))
+
+
+def tulis_pdf(folder_path, jumlah, seed=SEED):
+    # reportlab hanya dibutuhkan untuk membuat PDF; benchmark cukup memakai teks
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    os.makedirs(folder_path, exist_ok=True)
+    for nama, halaman in buat_banyak(jumlah, seed):
+        pdf = canvas.Canvas(os.path.join(folder_path, nama), pagesize=A4)
+        for text in halaman:
+            y = A4[1] - 40
+            for baris in text.split("\n"):
+                pdf.drawString(40, y, baris)
+                y -= 16
+            pdf.showPage()
+        pdf.save()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat transkrip sintetis untuk benchmark ETL")
+    parser.add_argument("jumlah", type=int)
+    parser.add_argument("--folder", default="data_sintetis")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--pdf", action="store_true", help="tulis PDF (butuh reportlab), bukan teks hasil ekstraksi")
+    args = parser.parse_args()
+
+    if args.pdf:
+        tulis_pdf(args.folder, args.jumlah, args.seed)
+    else:
+        tulis_teks(args.folder, args.jumlah, args.seed)
+    print(f"✅ {args.jumlah} transkrip sintetis ditulis ke {args.folder}")